@@ -1,5 +1,4 @@
 import argparse
-from nt_trader.runner import NewsTrader
 from nt_trader.config import load_config, merge_config_into_args
 
 
@@ -50,6 +49,8 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--state-file", type=str, default="nt_state.json", help="Path to persistent state file (cooldowns)")
     parser.add_argument("--log-file", type=str, default="logs/trades.csv", help="CSV log file for trade events")
     parser.add_argument("--decisions-log-file", type=str, default="logs/decisions.csv", help="CSV file for per-decision snapshots")
+    parser.add_argument("--verbosity", type=int, default=1, help="Console detail: 0 = per-symbol summary, orders and errors; 1 = also GPT details and skip/risk/dry-run reasons")
+    parser.add_argument("--quiet", action="store_true", help="Same as --verbosity 0")
     parser.add_argument("--clamp-news-rate", dest="clamp_news_rate", action="store_true", default=True, help="Clamp news poll rate to 1..5x/min in loop mode")
     parser.add_argument("--no-clamp-news-rate", dest="clamp_news_rate", action="store_false", help="Disable rate clamping")
 
@@ -85,6 +86,7 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--finnhub-min-interval-seconds", type=float, default=0.25, help="Minimum seconds between Finnhub requests")
     parser.add_argument("--symbols-per-batch", type=int, default=50, help="How many tickers to process before a batch sleep")
     parser.add_argument("--batch-sleep-seconds", type=float, default=5.0, help="Sleep between batches of symbols")
+    parser.add_argument("--symbol-workers", type=int, default=1, help="Process up to N symbols of a batch concurrently (1 = sequential)")
 
     # Local news cache
     parser.add_argument("--news-cache-file", type=str, default="logs/news_cache.json", help="Path to local news cache file")
@@ -132,6 +134,7 @@ def parse_args() -> argparse.Namespace:
     # Holdings watcher: dedicated thread for open positions
     parser.add_argument("--holdings-watcher", action="store_true", help="Track current holdings in a separate thread")
     parser.add_argument("--holdings-poll-seconds", type=float, default=20.0, help="Polling interval for holdings watcher thread")
+    parser.add_argument("--holdings-workers", type=int, default=1, help="Process up to N held symbols concurrently in the holdings watcher (1 = sequential; >1 is opt-in, like --symbol-workers)")
     # PDT + Tax awareness
     parser.add_argument("--enforce-pdt", action="store_true", help="Respect PDT limits for < $25k equity accounts")
     parser.add_argument("--pdt-min-equity", type=float, default=25000.0, help="Equity threshold for PDT checks")
@@ -195,6 +198,8 @@ def main() -> None:
     real_parser.add_argument("--state-file", type=str, default="nt_state.json")
     real_parser.add_argument("--log-file", type=str, default="logs/trades.csv")
     real_parser.add_argument("--decisions-log-file", type=str, default="logs/decisions.csv")
+    real_parser.add_argument("--verbosity", type=int, default=1)
+    real_parser.add_argument("--quiet", action="store_true")
     real_parser.add_argument("--clamp-news-rate", dest="clamp_news_rate", action="store_true", default=True)
     real_parser.add_argument("--no-clamp-news-rate", dest="clamp_news_rate", action="store_false")
     real_parser.add_argument("--price-history-window-min", type=float, default=30.0)
@@ -220,6 +225,7 @@ def main() -> None:
     real_parser.add_argument("--finnhub-min-interval-seconds", type=float, default=0.25)
     real_parser.add_argument("--symbols-per-batch", type=int, default=50)
     real_parser.add_argument("--batch-sleep-seconds", type=float, default=5.0)
+    real_parser.add_argument("--symbol-workers", type=int, default=1)
     real_parser.add_argument("--use-alpaca-data", action="store_true")
     real_parser.add_argument("--alpaca-data-base-url", type=str, default="https://data.alpaca.markets/v2")
     real_parser.add_argument("--snapshot-offhours-prices", action="store_true", default=False)
@@ -266,7 +272,10 @@ def main() -> None:
     real_parser.add_argument("--dd-require-both", action="store_true")
     real_parser.add_argument("--holdings-watcher", action="store_true")
     real_parser.add_argument("--holdings-poll-seconds", type=float, default=20.0)
+    real_parser.add_argument("--holdings-workers", type=int, default=1)
     args = merge_config_into_args(args, real_parser, cfg)
+    # Deferred so --help and argument errors don't pay for requests/vader/openai imports
+    from nt_trader.runner import NewsTrader
     NewsTrader(args).run()
 
 
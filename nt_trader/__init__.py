@@ -6,3 +6,10 @@ __all__ = [
     "runner",
 ]
 
+
+def __getattr__(name):
+    # Import submodules on first access so `import nt_trader` stays cheap
+    if name in __all__:
+        import importlib
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,56 +1,254 @@
 from __future__ import annotations
 
+import heapq
 import json
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 import requests
 import time
-from requests.exceptions import ConnectionError as ReqConnectionError, Timeout as ReqTimeout, RequestException
+from requests.exceptions import (
+    ConnectionError as ReqConnectionError,
+    ConnectTimeout as ReqConnectTimeout,
+    Timeout as ReqTimeout,
+    RequestException,
+)
 try:
     # For distinguishing protocol-level errors
     from urllib3.exceptions import ProtocolError  # type: ignore
 except Exception:  # pragma: no cover
     ProtocolError = Exception  # type: ignore
+try:
+    # Raised when the TCP connection could not be established (request never sent)
+    from urllib3.exceptions import NewConnectionError  # type: ignore
+except Exception:  # pragma: no cover
+    NewConnectionError = None  # type: ignore
 from requests.adapters import HTTPAdapter
+try:
+    from dateutil.parser import isoparse
+except Exception:  # pragma: no cover
+    isoparse = None  # type: ignore
+try:
+    import orjson  # optional, faster JSON parse/serialize
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
 try:
     # urllib3 Retry is available via requests dependency
     from urllib3.util.retry import Retry  # type: ignore
 except Exception:  # pragma: no cover
     Retry = None  # type: ignore
-
-
-# Reusable HTTP session with retries for Finnhub
-_SESSION = None
-
-
-def _get_session() -> requests.Session:
-    global _SESSION
-    if _SESSION is not None:
-        return _SESSION  # type: ignore[return-value]
-    s = requests.Session()
-    if Retry is not None:
-        retry = Retry(
-            total=3,
-            connect=3,
-            read=3,
-            backoff_factor=0.8,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["GET"],
-            raise_on_status=False,
-        )
-        adapter = HTTPAdapter(max_retries=retry, pool_maxsize=20, pool_connections=20)
+try:
+    # Compressed encodings urllib3 can decode here (adds br/zstd only when brotli/zstandard are installed)
+    from urllib3.util.request import ACCEPT_ENCODING  # type: ignore
+except Exception:  # pragma: no cover
+    ACCEPT_ENCODING = "gzip,deflate"
+
+
+# (connect, read) timeouts: an unreachable host fails in seconds so retries start sooner,
+# while slow-but-alive responses keep a per-endpoint read budget
+_CONNECT_TIMEOUT = 3.0
+_READ_TIMEOUT = {
+    "news": 20.0,
+    "quote": 10.0,
+    "gdelt": 20.0,
+    "order": 20.0,
+    "clock": 10.0,
+    "snapshots": 15.0,
+    "account": 10.0,
+    "positions": 15.0,
+}
+
+
+def _timeout(endpoint: str) -> tuple:
+    return (_CONNECT_TIMEOUT, _READ_TIMEOUT[endpoint])
+
+
+# Reusable pooled HTTP sessions keyed by retry policy:
+#   "default" - idempotent reads; urllib3 retries 429/5xx and connection errors
+#   "write"   - order/close calls; no adapter retries (see _retry_request)
+_SESSIONS: Dict[str, requests.Session] = {}
+_SESSIONS_LOCK = threading.Lock()
+# Per-host pools cached / keep-alive connections kept per host; sized for fan-out plus symbol workers
+_POOL_CONNECTIONS = 32
+_POOL_MAXSIZE = 64
+
+
+def _get_session(name: str = "default") -> requests.Session:
+    s = _SESSIONS.get(name)
+    if s is not None:
+        return s
+    with _SESSIONS_LOCK:
+        s = _SESSIONS.get(name)
+        if s is not None:
+            return s
+        s = requests.Session()
+        s.headers.update({
+            "Connection": "keep-alive",
+            "Accept-Encoding": ACCEPT_ENCODING,
+            "User-Agent": "nt_trader/1.0",
+        })
+        max_retries = 0
+        if Retry is not None and name == "default":
+            max_retries = Retry(
+                total=3,
+                connect=3,
+                read=3,
+                backoff_factor=0.8,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=["GET"],
+                raise_on_status=False,
+            )
+        adapter = HTTPAdapter(max_retries=max_retries, pool_maxsize=_POOL_MAXSIZE, pool_connections=_POOL_CONNECTIONS)
         s.mount("https://", adapter)
         s.mount("http://", adapter)
-    _SESSION = s
-    return s
+        _SESSIONS[name] = s
+        return s
+
+
+def close_sessions() -> None:
+    """Close pooled sessions and the fan-out executor; both are recreated on next use."""
+    with _SESSIONS_LOCK:
+        sessions = list(_SESSIONS.values())
+        _SESSIONS.clear()
+    for sess in sessions:
+        try:
+            sess.close()
+        except Exception:
+            pass
+    with _EXECUTOR_LOCK:
+        executors = list(_EXECUTORS.values())
+        _EXECUTORS.clear()
+    for ex in executors:
+        ex.shutdown(wait=False)
+
+
+# Worker pools for fanning out independent blocking HTTP calls, by nesting depth: level 1 serves
+# top-level fan-outs, level 2 serves fan-outs started from a level-1 worker. Deeper ones run inline.
+# Each level only waits on the next, so a nested fan-out can neither starve nor deadlock its parent.
+_EXECUTORS: Dict[int, ThreadPoolExecutor] = {}
+_EXECUTOR_LOCK = threading.Lock()
+_FANOUT_MAX_WORKERS = 16
+_FANOUT_MAX_DEPTH = 2
+# Snapshot chunks in flight at once in prices_batch
+_SNAPSHOT_CONCURRENCY = 4
+_in_worker = threading.local()
+
+
+def _get_executor(depth: int = 1) -> ThreadPoolExecutor:
+    with _EXECUTOR_LOCK:
+        ex = _EXECUTORS.get(depth)
+        if ex is None:
+            prefix = "nt-http" if depth == 1 else f"nt-http{depth}"
+            ex = _EXECUTORS[depth] = ThreadPoolExecutor(max_workers=_FANOUT_MAX_WORKERS, thread_name_prefix=prefix)
+        return ex
+
+
+def _run_in_worker(fn: Callable[[], Any], depth: int) -> Any:
+    _in_worker.depth = depth
+    try:
+        return fn()
+    finally:
+        _in_worker.depth = 0
+
+
+def fetch_many(calls: List[Callable[[], Any]]) -> List[Any]:
+    """Run independent zero-arg callables (typically HTTP fetches) concurrently.
+
+    Results are returned in input order; an exception from any call is re-raised.
+    The first call runs on the calling thread, which would otherwise just wait; a fan-out it starts
+    itself (e.g. chunked price fetches) therefore still gets the pool. A fan-out started from inside
+    a pool worker uses the next pool level, so it still overlaps without starving its parent's pool;
+    past _FANOUT_MAX_DEPTH calls run inline.
+    """
+    depth = getattr(_in_worker, "depth", 0) + 1
+    if len(calls) <= 1 or depth > _FANOUT_MAX_DEPTH:
+        return [fn() for fn in calls]
+    ex = _get_executor(depth)
+    futs = [ex.submit(_run_in_worker, fn, depth) for fn in calls[1:]]
+    first = calls[0]()
+    return [first] + [f.result() for f in futs]
+
+
+_TTL_CACHE: Dict[tuple, tuple] = {}
+_TTL_CACHE_LOCK = threading.Lock()
+
+
+def _ttl_cache(ttl_seconds: float) -> Callable:
+    """Memoize a parsed response per (function, args) for ttl_seconds.
+
+    Fetchers signal errors with None, which is never cached, so a failed call is retried by the next
+    caller. A cached result is shared by every caller until it expires; treat it as read-only.
+    """
+    def deco(fn: Callable) -> Callable:
+        name = fn.__name__
+
+        def wrapper(*args, **kwargs):
+            key = (name, args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            with _TTL_CACHE_LOCK:
+                hit = _TTL_CACHE.get(key)
+            if hit is not None and hit[0] > now:
+                return hit[1]
+            value = fn(*args, **kwargs)
+            if value is not None:
+                with _TTL_CACHE_LOCK:
+                    _TTL_CACHE[key] = (now + ttl_seconds, value)
+            return value
+
+        wrapper.__name__ = name
+        wrapper.__doc__ = fn.__doc__
+        wrapper.__wrapped__ = fn
+        return wrapper
+    return deco
+
+
+def invalidate(*funcs: Callable) -> None:
+    """Drop cached responses for the given _ttl_cache-wrapped functions."""
+    names = {getattr(f, "__name__", f) for f in funcs}
+    with _TTL_CACHE_LOCK:
+        for key in [k for k in _TTL_CACHE if k[0] in names]:
+            _TTL_CACHE.pop(key, None)
+
+
+def loads_json(data: bytes | str) -> Any:
+    """Parse JSON with orjson when available, stdlib json otherwise."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_json(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes with orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+# Parsed credential files keyed by resolved path -> (mtime_ns, data)
+_JSON_FILE_CACHE: Dict[str, tuple] = {}
 
 
 def load_json(path: Path) -> Dict:
     if not path.exists():
         raise FileNotFoundError(f"Missing required config: {path}")
-    with path.open("r", encoding="utf-8") as f:
-        return json.load(f)
+    key = str(path.resolve())
+    mtime = path.stat().st_mtime_ns
+    cached = _JSON_FILE_CACHE.get(key)
+    if cached is not None and cached[0] == mtime:
+        data = cached[1]
+    else:
+        data = loads_json(path.read_bytes())
+        _JSON_FILE_CACHE[key] = (mtime, data)
+    return dict(data) if isinstance(data, dict) else data
+
+
+def _news_ts(d: Dict) -> Any:
+    return d.get("datetime", 0)
 
 
 def finnhub_company_news(token: str, symbol: str, fr, to, limit: int) -> List[Dict]:
@@ -61,21 +259,21 @@ def finnhub_company_news(token: str, symbol: str, fr, to, limit: int) -> List[Di
         "to": to.strftime("%Y-%m-%d"),
         "token": token,
     }
-    r = _get_session().get(url, params=params, timeout=30)
+    r = _get_session().get(url, params=params, timeout=_timeout("news"))
     r.raise_for_status()
-    data = r.json()
+    data = loads_json(r.content)
     if not isinstance(data, list):
         return []
-    data.sort(key=lambda x: x.get("datetime", 0), reverse=True)
-    return data[:limit]
+    # Newest `limit` items in O(N log limit); same order as a full descending sort + slice
+    return heapq.nlargest(limit, (d for d in data if isinstance(d, dict)), key=_news_ts)
 
 
 def finnhub_quote(token: str, symbol: str) -> Optional[float]:
     url = "https://finnhub.io/api/v1/quote"
     params = {"symbol": symbol, "token": token}
-    r = _get_session().get(url, params=params, timeout=25)
+    r = _get_session().get(url, params=params, timeout=_timeout("quote"))
     r.raise_for_status()
-    q = r.json()
+    q = loads_json(r.content)
     price = q.get("c")
     try:
         return float(price) if price is not None else None
@@ -83,9 +281,76 @@ def finnhub_quote(token: str, symbol: str) -> Optional[float]:
         return None
 
 
+# Statuses worth retrying for write calls (throttled / temporarily unavailable)
+_RETRY_STATUSES = frozenset({429, 503})
+
+
+def _request_not_sent(exc: BaseException) -> bool:
+    """True when a request failed before reaching the server (connect timeout or refused/unresolved host)."""
+    if isinstance(exc, ReqConnectTimeout):
+        return True
+    if isinstance(exc, ReqConnectionError) and not isinstance(exc, ReqTimeout) and NewConnectionError is not None:
+        cause = exc.args[0] if exc.args else None
+        return isinstance(cause, NewConnectionError) or isinstance(getattr(cause, "reason", None), NewConnectionError)
+    return False
+
+
+def _retry_request(method: str, url: str, attempts: int = 3, base_delay: float = 1.0, max_delay: float = 30.0,
+                   jitter: float = 0.5, idempotent: bool = False, **kwargs) -> requests.Response:
+    """Send a request, retrying 429/503 and network errors with jittered exponential backoff.
+
+    Unless idempotent is set, only errors where the request never reached the server are retried:
+    after a read timeout or dropped connection the server may already have acted, and a repeated
+    write could act twice. Returns the final response (which may still be an error status);
+    re-raises the last network error.
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            r = _get_session("write").request(method, url, **kwargs)
+            if r.status_code not in _RETRY_STATUSES or attempt >= attempts:
+                return r
+        except (ReqConnectionError, ReqTimeout, ProtocolError) as e:
+            if attempt >= attempts or not (idempotent or _request_not_sent(e)):
+                raise
+        delay = min(max_delay, base_delay * (2 ** (attempt - 1)))
+        time.sleep(max(0.0, delay * (1.0 + random.uniform(-jitter, jitter))))
+    raise RuntimeError("unreachable")  # pragma: no cover
+
+
+def finnhub_quotes_batch(token: str, symbols: List[str], gate: Optional[Callable[[], None]] = None) -> Dict[str, Optional[float]]:
+    """Fetch Finnhub quotes for many symbols concurrently on the shared worker pool.
+
+    gate, when given, is called in the worker right before each request (e.g. a rate limiter).
+    Returns symbol -> price, with None for symbols that failed or had no quote.
+    """
+    def _one(sym: str) -> Optional[float]:
+        try:
+            if gate is not None:
+                gate()
+            return finnhub_quote(token, sym)
+        except Exception:
+            return None
+
+    syms = list(dict.fromkeys(symbols))
+    prices = fetch_many([(lambda s=s: _one(s)) for s in syms])
+    return dict(zip(syms, prices))
+
+
+@lru_cache(maxsize=8)
+def _alpaca_headers(key: str, secret: str, json_body: bool = False) -> Dict[str, str]:
+    """Alpaca auth headers, built once per credential pair. Treat the result as read-only."""
+    headers = {
+        "APCA-API-KEY-ID": key,
+        "APCA-API-SECRET-KEY": secret,
+    }
+    if json_body:
+        headers["Content-Type"] = "application/json"
+    return headers
+
+
 def safe_error_text(r: requests.Response) -> str:
     try:
-        return r.json().get("message") or r.text
+        return loads_json(r.content).get("message") or r.text
     except Exception:
         return r.text
 
@@ -95,56 +360,74 @@ def alpaca_place_order(base_url: str, key: str, secret: str, symbol: str, qty: O
                        order_class: Optional[str] = None, take_profit: Optional[Dict] = None,
                        stop_loss: Optional[Dict] = None, notional: Optional[float] = None) -> Dict:
     url = f"{base_url.rstrip('/')}/orders"
-    headers = {
-        "APCA-API-KEY-ID": key,
-        "APCA-API-SECRET-KEY": secret,
-        "Content-Type": "application/json",
-    }
-    payload: Dict = {
+    headers = _alpaca_headers(key, secret, True)
+    fields = {
         "symbol": symbol,
         "side": side,
         "type": type_,
         "time_in_force": tif,
+        "qty": qty,
+        "notional": float(notional) if notional is not None else None,
+        "client_order_id": client_order_id or None,
+        "order_class": order_class or None,
+        "take_profit": take_profit or None,
+        "stop_loss": stop_loss or None,
     }
-    if qty is not None:
-        payload["qty"] = qty
-    if notional is not None:
-        payload["notional"] = float(notional)
-    if client_order_id:
-        payload["client_order_id"] = client_order_id
-    if order_class:
-        payload["order_class"] = order_class
-    if take_profit:
-        payload["take_profit"] = take_profit
-    if stop_loss:
-        payload["stop_loss"] = stop_loss
-    # Network-transient safe retry: only on connection/timeout/protocol errors.
-    # Alpaca supports idempotency via client_order_id. We assume caller passes it.
-    attempts = 3
-    backoff = 1.0
-    last_exc: Optional[Exception] = None
-    for attempt in range(1, attempts + 1):
-        try:
-            r = requests.post(url, headers=headers, json=payload, timeout=20)
-            if r.status_code >= 400:
-                return {"status": "error", "code": r.status_code, "message": safe_error_text(r)}
-            return r.json()
-        except (ReqConnectionError, ReqTimeout, ProtocolError) as e:
-            last_exc = e
-            if attempt < attempts:
-                time.sleep(backoff)
-                backoff *= 1.5
-                continue
-            return {"status": "error", "code": "network", "message": str(e)}
-        except RequestException as e:
-            # Other request-layer errors
-            return {"status": "error", "code": "request", "message": str(e)}
-
-    # Fallback (should not reach)
-    return {"status": "error", "code": "unknown", "message": str(last_exc) if last_exc else "unknown error"}
+    payload: Dict = {k: v for k, v in fields.items() if v is not None}
+    # Alpaca rejects a repeated client_order_id, so with one the POST is safe to retry after a read timeout;
+    # without one only unsent requests are retried
+    try:
+        r = _retry_request("POST", url, idempotent=bool(client_order_id), headers=headers, data=dumps_json(payload),
+                           timeout=_timeout("order"))
+    except (ReqConnectionError, ReqTimeout, ProtocolError) as e:
+        return {"status": "error", "code": "network", "message": str(e)}
+    except RequestException as e:
+        # Other request-layer errors
+        return {"status": "error", "code": "request", "message": str(e)}
+    # Any accepted or rejected write may have moved positions/buying power
+    invalidate(alpaca_positions, alpaca_account)
+    if r.status_code >= 400:
+        return {"status": "error", "code": r.status_code, "message": safe_error_text(r)}
+    return loads_json(r.content)
 
 
 # ---- GDELT News (macro events) ----
+def _parse_seendate(s: str) -> int:
+    """GDELT seendate to epoch seconds (0 if unparseable).
+
+    Fixed-width UTC forms (20250901T070500Z, 2025-09-01T07:05:00Z) are sliced directly; anything else
+    goes through isoparse.
+    """
+    try:
+        if len(s) == 16 and s[8] == "T":
+            return int(datetime(int(s[0:4]), int(s[4:6]), int(s[6:8]), int(s[9:11]), int(s[11:13]),
+                                int(s[13:15]), tzinfo=timezone.utc).timestamp())
+        if len(s) == 20 and s[4] == "-" and s[10] == "T":
+            return int(datetime(int(s[0:4]), int(s[5:7]), int(s[8:10]), int(s[11:13]), int(s[14:16]),
+                                int(s[17:19]), tzinfo=timezone.utc).timestamp())
+        if isoparse is not None:
+            return int(isoparse(s).timestamp())
+    except Exception:
+        pass
+    return 0
+
+
+@lru_cache(maxsize=64)
+def _gdelt_params(themes: tuple, max_records: int, timespan_min: int) -> Optional[Dict[str, str]]:
+    """Request params for a theme set, built once per (themes, max_records, timespan). Read-only."""
+    query = " OR ".join([f"theme:{t.strip()}" for t in themes if t])
+    if not query:
+        return None
+    return {
+        "query": query,
+        "mode": "ArtList",
+        "maxrecords": str(max_records),
+        "timespan": f"{timespan_min}min",
+        "format": "json",
+        "sort": "DateDesc",
+    }
+
+
 def fetch_gdelt_docs(themes: List[str], max_records: int = 30, timespan_min: int = 180) -> List[Dict]:
     """Fetch recent GDELT Doc 2.1 items for selected themes (macro/political events).
 
@@ -152,22 +435,14 @@ def fetch_gdelt_docs(themes: List[str], max_records: int = 30, timespan_min: int
     """
     if not themes:
         return []
-    query = " OR ".join([f"theme:{t.strip()}" for t in themes if t and isinstance(t, str)])
-    if not query:
+    params = _gdelt_params(tuple(t for t in themes if isinstance(t, str)), int(max_records), int(timespan_min))
+    if params is None:
         return []
     url = "https://api.gdeltproject.org/api/v2/doc/doc"
-    params = {
-        "query": query,
-        "mode": "ArtList",
-        "maxrecords": str(int(max_records)),
-        "timespan": f"{int(timespan_min)}min",
-        "format": "json",
-        "sort": "DateDesc",
-    }
     try:
-        r = requests.get(url, params=params, timeout=25)
+        r = _get_session().get(url, params=params, timeout=_timeout("gdelt"))
         r.raise_for_status()
-        data = r.json() or {}
+        data = loads_json(r.content) or {}
         arts = data.get("articles") or []
     except Exception:
         return []
@@ -180,13 +455,7 @@ def fetch_gdelt_docs(themes: List[str], max_records: int = 30, timespan_min: int
             domain = a.get("domain") or a.get("sourceCommonName") or "GDELT"
             seendate = a.get("seendate")  # e.g., 2025-09-01T07:05:00Z
             # Convert seendate to epoch seconds if possible
-            dt_epoch = 0
-            if isinstance(seendate, str):
-                try:
-                    from dateutil.parser import isoparse
-                    dt_epoch = int(isoparse(seendate).timestamp())
-                except Exception:
-                    dt_epoch = 0
+            dt_epoch = _parse_seendate(seendate) if isinstance(seendate, str) else 0
             ident = url_ or (title + seendate)
             out.append({
                 "id": ident,
@@ -203,23 +472,38 @@ def fetch_gdelt_docs(themes: List[str], max_records: int = 30, timespan_min: int
 
 
 # ---- Alpaca market clock ----
+@_ttl_cache(60)
 def alpaca_clock(base_url: str, key: str, secret: str) -> Optional[Dict]:
     """Fetch Alpaca market clock. Returns dict with fields like {"is_open": bool} or None on error."""
     try:
         url = f"{base_url.rstrip('/')}/clock"
-        headers = {
-            "APCA-API-KEY-ID": key,
-            "APCA-API-SECRET-KEY": secret,
-        }
-        r = requests.get(url, headers=headers, timeout=15)
+        headers = _alpaca_headers(key, secret)
+        r = _get_session().get(url, headers=headers, timeout=_timeout("clock"))
         if r.status_code >= 400:
             return None
-        return r.json()
+        data = loads_json(r.content)
+        return data if isinstance(data, dict) else None
     except Exception:
         return None
 
 
-def alpaca_snapshots(symbols: List[str], key: str, secret: str, data_base_url: Optional[str] = None, timeout: int = 20) -> Dict[str, Optional[float]]:
+def _extract_price(snap: Any) -> Optional[float]:
+    """Latest trade price from a snapshot, falling back to the daily bar close."""
+    if not isinstance(snap, dict):
+        return None
+    lt = snap.get("latestTrade") or {}
+    price = lt.get("p") or lt.get("price")
+    if price is None:
+        db = snap.get("dailyBar") or {}
+        price = db.get("c") or db.get("close")
+    try:
+        return float(price) if price is not None else None
+    except Exception:
+        return None
+
+
+def alpaca_snapshots(symbols: List[str], key: str, secret: str, data_base_url: Optional[str] = None,
+                     timeout: Optional[float] = None) -> Dict[str, Optional[float]]:
     """Fetch multiple stock snapshots from Alpaca Data API.
 
     Returns a mapping symbol -> last trade price (float) when available, else None.
@@ -231,85 +515,111 @@ def alpaca_snapshots(symbols: List[str], key: str, secret: str, data_base_url: O
     url = f"{base}/stocks/snapshots"
     # Alpaca expects comma-separated symbols; limit length to avoid URL size issues
     params = {"symbols": ",".join(symbols)}
-    headers = {
-        "APCA-API-KEY-ID": key,
-        "APCA-API-SECRET-KEY": secret,
-    }
+    headers = _alpaca_headers(key, secret)
     out: Dict[str, Optional[float]] = {s: None for s in symbols}
     try:
-        r = requests.get(url, headers=headers, params=params, timeout=timeout)
+        r = _get_session().get(url, headers=headers, params=params,
+                               timeout=(_CONNECT_TIMEOUT, timeout or _READ_TIMEOUT["snapshots"]))
         r.raise_for_status()
-        data = r.json() or {}
+        data = loads_json(r.content) or {}
         # Alpaca used to nest results under a 'snapshots' key; newer responses are already a symbol map.
         snaps_candidate = data.get("snapshots") if isinstance(data, dict) else None
         snaps = snaps_candidate if isinstance(snaps_candidate, dict) else data
         if isinstance(snaps, dict):
-            for sym, snap in snaps.items():
-                # Try latest trade price, then daily bar close as fallback.
-                price = None
-                if isinstance(snap, dict):
-                    lt = snap.get("latestTrade") or {}
-                    price = lt.get("p") or lt.get("price")
-                    if price is None:
-                        db = snap.get("dailyBar") or {}
-                        price = db.get("c") or db.get("close")
-                sym_key = str(sym or "").upper()
-                try:
-                    out[sym_key] = float(price) if price is not None else None
-                except Exception:
-                    out[sym_key] = None
+            out.update({str(sym or "").upper(): _extract_price(snap) for sym, snap in snaps.items()})
         return out
     except Exception:
         return out
 
 
+def prices_batch(symbols: List[str], key: str, secret: str, finnhub_token: Optional[str] = None,
+                 data_base_url: Optional[str] = None, chunk_size: int = 30,
+                 gate: Optional[Callable[[], None]] = None) -> Dict[str, Optional[float]]:
+    """Price many symbols with as few requests as possible.
+
+    Uses Alpaca snapshots in chunks of chunk_size symbols (keeps the URL bounded), then falls back
+    to Finnhub quotes only for symbols the snapshots did not price, when finnhub_token is given.
+    gate is forwarded to finnhub_quotes_batch.
+    """
+    out: Dict[str, Optional[float]] = {s: None for s in symbols}
+    if not symbols:
+        return out
+    step = max(1, int(chunk_size))
+    # Sorted, de-duplicated chunks give identical query strings from poll to poll (cache friendly);
+    # small chunks keep tail latency down and a failed chunk only loses its own symbols
+    ordered = sorted(out)
+    chunks = [ordered[i : i + step] for i in range(0, len(ordered), step)]
+    # Chunks are independent requests; fetch them concurrently on the shared fan-out pool, a few at a
+    # time so a large universe does not burst the data API
+    calls = [lambda c=c: alpaca_snapshots(c, key, secret, data_base_url) for c in chunks]
+    for i in range(0, len(calls), _SNAPSHOT_CONCURRENCY):
+        for snaps in fetch_many(calls[i : i + _SNAPSHOT_CONCURRENCY]):
+            out.update(snaps)
+    missing = [s for s in symbols if out.get(s) is None]
+    if finnhub_token and missing:
+        for sym, px in finnhub_quotes_batch(finnhub_token, missing, gate=gate).items():
+            if px is not None:
+                out[sym] = px
+    return out
+
+
+@_ttl_cache(30)
 def alpaca_account(base_url: str, key: str, secret: str) -> Optional[Dict]:
     """Fetch Alpaca account details (paper). Returns dict or None on error."""
     try:
         url = f"{base_url.rstrip('/')}/account"
-        headers = {
-            "APCA-API-KEY-ID": key,
-            "APCA-API-SECRET-KEY": secret,
-        }
-        r = requests.get(url, headers=headers, timeout=15)
+        headers = _alpaca_headers(key, secret)
+        r = _get_session().get(url, headers=headers, timeout=_timeout("account"))
         if r.status_code >= 400:
             return None
-        return r.json()
+        data = loads_json(r.content)
+        return data if isinstance(data, dict) else None
     except Exception:
         return None
 
 
-def alpaca_positions(base_url: str, key: str, secret: str) -> List[Dict]:
-    """Fetch all open positions. Returns a list of position dicts."""
+@_ttl_cache(5)
+def alpaca_positions(base_url: str, key: str, secret: str) -> Optional[List[Dict]]:
+    """Fetch all open positions. Returns a list of position dicts ([] when flat), or None on error."""
     try:
         url = f"{base_url.rstrip('/')}/positions"
-        headers = {
-            "APCA-API-KEY-ID": key,
-            "APCA-API-SECRET-KEY": secret,
-        }
-        r = requests.get(url, headers=headers, timeout=20)
+        headers = _alpaca_headers(key, secret)
+        r = _get_session().get(url, headers=headers, timeout=_timeout("positions"))
         if r.status_code >= 400:
-            return []
-        data = r.json()
-        return data if isinstance(data, list) else []
+            return None
+        data = loads_json(r.content)
+        return data if isinstance(data, list) else None
     except Exception:
-        return []
+        return None
+
+
+def alpaca_positions_map(base_url: str, key: str, secret: str) -> Optional[Dict[str, Dict]]:
+    """All open positions keyed by upper-case symbol, from a single /positions call; None on error.
+
+    Built from the TTL-cached alpaca_positions rather than cached itself, so it is never staler than
+    that one cache and invalidating alpaca_positions is enough.
+    """
+    positions = alpaca_positions(base_url, key, secret)
+    if positions is None:
+        return None
+    out: Dict[str, Dict] = {}
+    for p in positions:
+        if isinstance(p, dict):
+            out[str(p.get("symbol", "")).upper()] = p
+    return out
 
 
 def alpaca_position_for_symbol(base_url: str, key: str, secret: str, symbol: str) -> Optional[Dict]:
     """Fetch open position for a specific symbol, or None if none."""
     try:
         url = f"{base_url.rstrip('/')}/positions/{symbol}"
-        headers = {
-            "APCA-API-KEY-ID": key,
-            "APCA-API-SECRET-KEY": secret,
-        }
-        r = requests.get(url, headers=headers, timeout=15)
+        headers = _alpaca_headers(key, secret)
+        r = _get_session().get(url, headers=headers, timeout=_timeout("positions"))
         if r.status_code == 404:
             return None
         if r.status_code >= 400:
             return None
-        return r.json()
+        return loads_json(r.content)
     except Exception:
         return None
 
@@ -318,16 +628,15 @@ def alpaca_close_position(base_url: str, key: str, secret: str, symbol: str, qty
     """Close open position. qty can be a string like 'all' or a numeric string."""
     try:
         url = f"{base_url.rstrip('/')}/positions/{symbol}"
-        headers = {
-            "APCA-API-KEY-ID": key,
-            "APCA-API-SECRET-KEY": secret,
-        }
+        headers = _alpaca_headers(key, secret)
         params = {}
         if qty:
             params["qty"] = str(qty)
-        r = requests.delete(url, headers=headers, params=params, timeout=20)
+        # Not idempotent (a repeated partial close sells twice): only unsent requests are retried
+        r = _retry_request("DELETE", url, headers=headers, params=params, timeout=_timeout("order"))
+        invalidate(alpaca_positions, alpaca_account)
         if r.status_code >= 400:
             return {"status": "error", "code": r.status_code, "message": safe_error_text(r)}
-        return r.json() if r.text else {"status": "ok"}
+        return loads_json(r.content) if r.content else {"status": "ok"}
     except Exception as e:
         return {"status": "error", "message": str(e)}
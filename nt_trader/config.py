@@ -3,13 +3,23 @@ from __future__ import annotations
 import json
 import os
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
+
+try:
+    import orjson  # optional, faster JSON parse
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+
+# Parsed config keyed by resolved path -> (mtime_ns, data)
+_CONFIG_CACHE: Dict[str, Tuple[int, Dict[str, Any]]] = {}
 
 
 def load_config(config_path: str | None) -> Dict[str, Any]:
     """Load JSON config if present; return {} otherwise.
 
-    Falls back to ./config.json if path is None and file exists.
+    Falls back to ./config.json if path is None and file exists. Parsed results are
+    cached per path and reused until the file's mtime changes.
     """
     path: Path | None = None
     if config_path:
@@ -21,8 +31,17 @@ def load_config(config_path: str | None) -> Dict[str, Any]:
     if not path or not path.exists():
         return {}
     try:
-        with path.open("r", encoding="utf-8") as f:
-            return json.load(f)
+        key = str(path.resolve())
+        mtime = path.stat().st_mtime_ns
+        cached = _CONFIG_CACHE.get(key)
+        if cached is not None and cached[0] == mtime:
+            return dict(cached[1])
+        raw = path.read_bytes()
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        if isinstance(data, dict):
+            _CONFIG_CACHE[key] = (mtime, data)
+            return dict(data)
+        return data
     except Exception:
         return {}
 
@@ -35,22 +54,24 @@ def merge_config_into_args(args, parser, cfg: Dict[str, Any]):
     """
     import sys
 
-    argv = set(sys.argv[1:])
-    # Build map from dest -> possible option strings
-    mapping = {}
-    for action in parser._actions:
-        if not getattr(action, "option_strings", None):
-            continue
-        mapping[action.dest] = set(action.option_strings)
+    argv = frozenset(sys.argv[1:])
+    # dest -> option strings, built once per parser
+    mapping = getattr(parser, "_dest_map", None)
+    if mapping is None:
+        mapping = {
+            action.dest: frozenset(action.option_strings)
+            for action in parser._actions
+            if getattr(action, "option_strings", None)
+        }
+        parser._dest_map = mapping
 
     for key, value in cfg.items():
         dest = key.replace("-", "_")
-        if dest not in mapping:
+        option_strings = mapping.get(dest)
+        if option_strings is None:
             # Unknown key in config; ignore
             continue
-        option_strings = mapping[dest]
-        used = any(opt in argv for opt in option_strings)
-        if not used:
+        if not (option_strings & argv):
             setattr(args, dest, value)
 
     return args
@@ -1,13 +1,138 @@
 from __future__ import annotations
 
+import atexit
 import csv
-from dataclasses import dataclass, asdict
+import queue
+import sys
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from operator import attrgetter
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
+# Slotted events are smaller and faster to build; dataclass(slots=...) needs Python 3.10+
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+# Last formatted timestamp as (epoch second, iso string); timestamps have 1s resolution
+_NOW_ISO: tuple = (-1, "")
+
+# Sentinel that tells a _LogWorker to write what it has and exit
+_STOP = object()
+_LOG_BATCH_MAX = 128
+_WORKERS: "weakref.WeakSet[_LogWorker]" = weakref.WeakSet()
+
+
+class _LogWorker:
+    """Daemon thread that owns a CSV file and writes queued rows in batches.
+
+    log() callers only enqueue a row tuple, so disk I/O never runs on the strategy thread.
+    """
+
+    def __init__(self, path: Path, header: tuple) -> None:
+        self.path = path
+        self.q: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._fh = path.open("a", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._fh)
+        if self._fh.tell() == 0:
+            self._writer.writerow(header)
+            self._fh.flush()
+        self._closed = False
+        # Serializes the post-close synchronous writes in put()
+        self._sync_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=f"log-writer:{path.name}", daemon=True)
+        self._thread.start()
+        _WORKERS.add(self)
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            batch = []
+            waiters = []
+            item = self.q.get()
+            while True:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                if len(batch) >= _LOG_BATCH_MAX:
+                    break
+                try:
+                    # After _STOP keep draining: rows queued while close() was in progress still get written
+                    item = self.q.get_nowait()
+                except queue.Empty:
+                    break
+            self._write(batch)
+            for ev in waiters:
+                ev.set()
+        try:
+            self._fh.close()
+        except Exception as e:
+            _report_write_error(self.path, 0, e)
+
+    def _write(self, rows: list) -> None:
+        try:
+            if rows:
+                self._writer.writerows(rows)
+            self._fh.flush()
+        except Exception as e:
+            # Runs off the caller's thread, so the failure cannot be raised to it; report it instead
+            _report_write_error(self.path, len(rows), e)
+
+    def put(self, row: tuple) -> None:
+        if not self._closed:
+            self.q.put(row)
+            return
+        # Closed: the writer thread is gone, so append synchronously and let failures reach the caller
+        with self._sync_lock:
+            with self.path.open("a", newline="", encoding="utf-8") as fh:
+                csv.writer(fh).writerow(row)
+
+    def flush(self, timeout: Optional[float] = 5.0) -> None:
+        """Block until rows queued before this call are on disk."""
+        if self._closed:
+            return
+        ev = threading.Event()
+        self.q.put(ev)
+        ev.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        if self._closed:
+            return
+        self.q.put(_STOP)
+        self._thread.join(timeout)
+        # Only now do put() calls switch to synchronous writes; earlier ones were drained by the worker,
+        # except any that raced in after it exited, which are written here
+        self._closed = True
+        while True:
+            try:
+                item = self.q.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is not _STOP:
+                self.put(item)
+
+
+def _report_write_error(path: Path, rows: int, err: Exception) -> None:
+    try:
+        print(f"[log] failed to write {rows} row(s) to {path}: {err}", file=sys.stderr)
+    except Exception:
+        pass
+
+
+@atexit.register
+def _drain_log_workers() -> None:
+    for w in list(_WORKERS):
+        w.close()
+
+
+@dataclass(**_SLOTS)
 class TradeEvent:
     ts: str
     mode: str  # dry-run | trade
@@ -31,39 +156,49 @@ class TradeEvent:
 
 
 class TradeLogger:
+    _FIELDS = (
+        "ts","mode","symbol","action","side","qty","price","decision_source",
+        "sentiment","vader","gpt","gpt_decision","gpt_exp_move_pct","gpt_emotions",
+        "tp_price","sl_price",
+        "order_id","status","error",
+    )
+    # Row tuple straight from the event attributes; no intermediate dict per row
+    _row = staticmethod(attrgetter(*_FIELDS))
+
     def __init__(self, log_path: str | Path) -> None:
         self.path = Path(log_path)
         self.path.parent.mkdir(parents=True, exist_ok=True)
-        self._ensure_header()
-
-    def _ensure_header(self) -> None:
-        if self.path.exists() and self.path.stat().st_size > 0:
-            return
-        with self.path.open("w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=[
-                "ts","mode","symbol","action","side","qty","price","decision_source",
-                "sentiment","vader","gpt","gpt_decision","gpt_exp_move_pct","gpt_emotions",
-                "tp_price","sl_price",
-                "order_id","status","error"
-            ])
-            writer.writeheader()
+        # Rows are written by a background worker; the header is written up front if the file is new
+        self._worker = _LogWorker(self.path, self._FIELDS)
 
     def log(self, event: TradeEvent) -> None:
-        with self.path.open("a", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=[
-                "ts","mode","symbol","action","side","qty","price","decision_source",
-                "sentiment","vader","gpt","gpt_decision","gpt_exp_move_pct","gpt_emotions",
-                "tp_price","sl_price",
-                "order_id","status","error"
-            ])
-            writer.writerow(asdict(event))
+        self._worker.put(self._row(event))
+
+    def flush(self) -> None:
+        self._worker.flush()
+
+    def close(self) -> None:
+        self._worker.close()
+
+    def __enter__(self) -> "TradeLogger":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
 
     @staticmethod
     def now_iso() -> str:
-        return datetime.now().isoformat(timespec="seconds")
+        global _NOW_ISO
+        sec = int(time.time())
+        cached = _NOW_ISO
+        if cached[0] == sec:
+            return cached[1]
+        iso = datetime.fromtimestamp(sec).isoformat(timespec="seconds")
+        _NOW_ISO = (sec, iso)
+        return iso
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class DecisionEvent:
     ts: str
     symbol: str
@@ -82,25 +217,28 @@ class DecisionEvent:
 
 
 class DecisionsLogger:
+    _FIELDS = (
+        "ts","symbol","price","vader","gpt","sentiment","action","strategy",
+        "gpt_conf","emotions","exp_move_pct","price_change_pct","vol_pct","trend",
+    )
+    _row = staticmethod(attrgetter(*_FIELDS))
+
     def __init__(self, log_path: str | Path) -> None:
         self.path = Path(log_path)
         self.path.parent.mkdir(parents=True, exist_ok=True)
-        self._ensure_header()
-
-    def _ensure_header(self) -> None:
-        if self.path.exists() and self.path.stat().st_size > 0:
-            return
-        with self.path.open("w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=[
-                "ts","symbol","price","vader","gpt","sentiment","action","strategy",
-                "gpt_conf","emotions","exp_move_pct","price_change_pct","vol_pct","trend"
-            ])
-            writer.writeheader()
+        self._worker = _LogWorker(self.path, self._FIELDS)
 
     def log(self, event: DecisionEvent) -> None:
-        with self.path.open("a", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=[
-                "ts","symbol","price","vader","gpt","sentiment","action","strategy",
-                "gpt_conf","emotions","exp_move_pct","price_change_pct","vol_pct","trend"
-            ])
-            writer.writerow(asdict(event))
+        self._worker.put(self._row(event))
+
+    def flush(self) -> None:
+        self._worker.flush()
+
+    def close(self) -> None:
+        self._worker.close()
+
+    def __enter__(self) -> "DecisionsLogger":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -1,27 +1,59 @@
 ﻿from __future__ import annotations
 
-import json
+import os
 import time
 import hashlib
 import re
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 import threading
+from collections import deque
+from itertools import chain, islice
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Sequence, Tuple
 import random
 
+try:
+    import xxhash  # optional, much faster non-cryptographic event-key hashing
+except Exception:  # pragma: no cover
+    xxhash = None  # type: ignore
+
+# Fields of the price-context summary, e.g. "change=+1.23%, vol~0.45%, trend=up, series=[1.0, 2.0]"
+_PRICE_CTX_RE = re.compile(
+    r"change=(?P<chg>[^%]*)%|vol~(?P<vol>[^%]*)%|trend=(?P<tr>[^,]*)|series=\[(?P<ser>[^\]]*)"
+)
+
+# Extra seconds close() waits for a holdings watcher that is still mid-pass
+_WATCHER_JOIN_TIMEOUT = 60.0
+
+# Age (s) after which a batch-prefetched price is no longer used when price_poll_seconds is unset
+_BATCH_PRICE_MAX_AGE = 60.0
+
+# News dedupe tokenizer: built once instead of per item
+_NON_ALNUM = re.compile(r"[^a-z0-9\s]+")
+_STOPWORDS = frozenset({
+    "the","and","for","with","from","into","over","this","that","are","was","were","will","has","have","had",
+    "a","an","of","to","in","on","by","as","at","is","it",
+})
+
 from .clients import (
     load_json,
+    loads_json,
+    dumps_json,
     finnhub_company_news,
     finnhub_quote,
+    finnhub_quotes_batch,
     alpaca_place_order,
     fetch_gdelt_docs,
     alpaca_clock,
-    alpaca_snapshots,
-    alpaca_positions,
+    prices_batch,
     alpaca_position_for_symbol,
+    alpaca_positions_map,
     alpaca_close_position,
     alpaca_account,
+    fetch_many,
+    close_sessions,
 )
 from .sentiment import get_vader, score_news_vader, init_openai_client, gpt_analyze_text
 from .strategy import aggregate_sentiment, decide_action, summarize_gpt_details
@@ -30,10 +62,17 @@ from .logger import TradeLogger, TradeEvent, DecisionsLogger, DecisionEvent
 
 
 class NewsTrader:
+    # Client order id templates: one base per symbol pass, then side/leg/qty per order
+    _OID_BASE_TMPL = "nt-{sym}-{ts}"
+    _OID_TMPL = "{base}-{side}-{qty}"
+    _OID_LEG_TMPL = "{base}-{side}-{tag}-{qty}"
+
     def __init__(self, args) -> None:
         self.args = args
         self.state_path = Path(getattr(args, "state_file", "nt_state.json"))
         self.state: Dict[str, Dict[str, float]] = self._load_state()
+        # Set whenever self.state changes; periodic saves are skipped while it is clear
+        self._state_dirty = False
         self.finnhub_cfg = load_json(Path("finnhub.json"))
         self.finnhub_token = self.finnhub_cfg.get("api_key") or self.finnhub_cfg.get("token")
         if not self.finnhub_token:
@@ -63,10 +102,18 @@ class NewsTrader:
         self.gpt_client = init_openai_client() if getattr(args, "use_gpt", False) else None
         self.logger = TradeLogger(getattr(args, "log_file", "logs/trades.csv"))
         self.decisions_logger = DecisionsLogger(getattr(args, "decisions_log_file", "logs/decisions.csv"))
+        # Console detail: 0 = per-symbol summary, orders and errors; 1 (default) adds GPT details and
+        # skip/risk/dry-run reasons. --quiet is shorthand for --verbosity 0.
+        self.verbosity: int = 0 if getattr(args, "quiet", False) else int(getattr(args, "verbosity", 1))
 
         # Locks and thread controls
         self._fh_lock = threading.Lock()
         self._state_io_lock = threading.Lock()
+        self._state_write_lock = threading.Lock()
+        self._news_cache_lock = threading.Lock()
+        # Periodic state saves are coalesced to one background write per max(30s, poll interval)
+        self._last_save_ts = 0.0
+        self._save_thread: Optional[threading.Thread] = None
         self._holdings_thread: Optional[threading.Thread] = None
         self._stop_holdings = threading.Event()
 
@@ -114,6 +161,19 @@ class NewsTrader:
         self.poll_seconds: float = float(getattr(args, "poll_seconds", 60.0))
         self.strategy: str = str(getattr(args, "strategy", "rule")).lower()
         self.gpt_conf_min: float = float(getattr(args, "gpt_decision_min_confidence", 0.0) or 0.0)
+        # GPT knobs read on every news item; resolve once instead of per lookup
+        self.use_gpt: bool = bool(getattr(args, "use_gpt", False))
+        self.use_gpt_decision: bool = bool(getattr(args, "use_gpt_decision", False))
+        self.gpt_weight: float = max(0.0, min(1.0, float(getattr(args, "gpt_weight", 0.5))))
+        self.gpt_max_news: int = max(0, int(getattr(args, "gpt_max_news", 3)))
+        self.gpt_min_abs_vader: float = float(getattr(args, "gpt_min_abs_vader", 0.1))
+        self.gpt_min_window_move_pct: float = float(getattr(args, "gpt_min_window_move_pct", 0.5))
+        # Strategy-specific decision step, resolved once; unknown strategies behave like "rule"
+        self._decide_fn: Callable[[float, Optional[str], Optional[float]], Tuple[str, str]] = {
+            "gpt": self._decide_gpt,
+            "hybrid": self._decide_hybrid,
+        }.get(self.strategy, self._decide_rule)
+        self.macro_affects_sentiment: bool = bool(getattr(args, "macro_affects_sentiment", False))
         # Exit threshold when already in a long position (more conservative than general close-threshold)
         self.in_pos_exit_sentiment: float = float(getattr(args, "in_pos_exit_sentiment", -0.05))
         # Price factor blending
@@ -140,6 +200,8 @@ class NewsTrader:
         self.market_only_trade: bool = bool(getattr(args, "market_only_trade", True))
         self.market_only_price: bool = bool(getattr(args, "market_only_price", True))
         self.market_tz: str = str(getattr(args, "market_timezone", "America/New_York"))
+        # Resolved once; None falls back to local time
+        self._market_zone = _load_zone(self.market_tz)
         # GDELT settings and cache
         self.use_gdelt: bool = bool(getattr(args, "gdelt", False))
         self.gdelt_themes: List[str] = [t.strip() for t in str(getattr(args, "gdelt_themes", "")).split(",") if t.strip()]
@@ -155,14 +217,35 @@ class NewsTrader:
 
         # Seen-news / GPT cache controls
         self.max_seen_news_per_symbol: int = int(getattr(args, "max_seen_news_per_symbol", 500))
+        # Live seen_events per (symbol, field) as (membership set, bounded insertion order);
+        # loaded lazily from state and written back to the JSON lists by _save_state
+        self._seen: Dict[Tuple[str, str], Tuple[set, Deque[str]]] = {}
+        # Live price_series per symbol as a ring buffer of the newest points; written back by _save_state
+        self._price_series: Dict[str, Deque[Dict[str, float]]] = {}
+        # In-memory per-symbol VADER scores keyed by event key (not persisted)
+        self._vader_cache: Dict[str, Dict[str, float]] = {}
+        # VADER scores for events already seen this pass, shared across symbols. Only the text-only VADER
+        # score is shared: GPT verdicts depend on the symbol's price context and stay per symbol (macro items
+        # use the global GPT cache). Cleared at the start of every pass over the tickers to keep it bounded
+        self._run_scores: Dict[str, float] = {}
         self.clamp_news_rate: bool = bool(getattr(args, "clamp_news_rate", True))
 
         # Finnhub global rate limiting and batching
         self.fh_max_rpm: int = int(getattr(args, "finnhub_max_rpm", 50))
         self.fh_min_interval: float = float(getattr(args, "finnhub_min_interval_seconds", 0.25))
+        # In-memory timers (rate gate, GDELT refresh, account cache) use time.monotonic(); persisted
+        # timestamps in self.state stay wall-clock so they survive restarts
         self._fh_last_call_ts: float = 0.0
-        self._fh_call_times: List[float] = []
+        # Finnhub call timestamps in call order; oldest at the left for O(1) expiry. Only the newest
+        # fh_max_rpm entries matter to the gate, so the deque is bounded (it also caps growth when rpm is 0)
+        self._fh_call_times: Deque[float] = deque(maxlen=self.fh_max_rpm if self.fh_max_rpm > 0 else 4096)
+        # Prices fetched by the batch prefetch as (price, monotonic ts), consumed by _process_symbol for the
+        # same batch; entries older than _batch_price_max_age() are ignored and purged on the next prefetch
+        self._batch_prices: Dict[str, Tuple[float, float]] = {}
         self.symbols_per_batch: int = int(getattr(args, "symbols_per_batch", 50))
+        # Symbols within a batch processed concurrently; the Finnhub gate still paces the requests
+        self.symbol_workers: int = max(1, int(getattr(args, "symbol_workers", 1) or 1))
+        self._symbol_pool: Optional[ThreadPoolExecutor] = None
         self.batch_sleep_seconds: float = float(getattr(args, "batch_sleep_seconds", 5.0))
         self.use_alpaca_data: bool = bool(getattr(args, "use_alpaca_data", False))
         self.alpaca_data_base_url: str = str(getattr(args, "alpaca_data_base_url", "https://data.alpaca.markets/v2"))
@@ -182,6 +265,10 @@ class NewsTrader:
         self.core_sl_pct: float = float(getattr(args, "core_sl_pct", 0.03))
         self.allocation_pct: float = max(0.0, min(1.0, float(getattr(args, "allocation_pct", 0.2))))
         self._acct_cache: Dict[str, float] = {}
+        # (monotonic ts, is_open) from the last local-time market-hours check
+        self._mkt_open_cache: Optional[Tuple[float, bool]] = None
+        # _daytrade_count_5d() memo as (calendar day, count); cleared when _record_exit adds a PDT day
+        self._dt_count_memo: Optional[Tuple[str, int]] = None
         self.long_only: bool = bool(getattr(args, "long_only", True))
         # Order sizing
         self.order_size_mode: str = str(getattr(args, "order_size_mode", "auto")).lower()
@@ -210,6 +297,10 @@ class NewsTrader:
         # Holdings watcher options
         self.holdings_watcher: bool = bool(getattr(args, "holdings_watcher", False))
         self.holdings_poll_seconds: float = float(getattr(args, "holdings_poll_seconds", 20.0))
+        # Held symbols processed concurrently by the watcher (opt-in, default sequential); the Finnhub gate
+        # still paces the requests
+        self.holdings_workers: int = max(1, int(getattr(args, "holdings_workers", 1) or 1))
+        self._holdings_pool: Optional[ThreadPoolExecutor] = None
         # PDT / Tax awareness
         self.enforce_pdt: bool = bool(getattr(args, "enforce_pdt", False))
         self.pdt_min_equity: float = float(getattr(args, "pdt_min_equity", 25000.0))
@@ -234,60 +325,135 @@ class NewsTrader:
             mode = "TRADE (live)" if getattr(self, "alpaca_env", "paper") == "live" else "TRADE (paper)"
         print(f"  Mode: {mode}")
         print(f"  Thresholds: pos={self.args.pos_threshold}, close={self.args.close_threshold}, in-pos-exit={self.in_pos_exit_sentiment}")
-        if getattr(self.args, "use_gpt", False):
+        if self.use_gpt:
             enabled = bool(self.gpt_client)
             print(f"  GPT: {'ON' if enabled else 'ON (no key found, falling back)'} | model={self.args.gpt_model} | weight={self.args.gpt_weight}")
 
     def run(self) -> None:
+        try:
+            self._run()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Stop background workers, flush state and CSV logs, and release pooled HTTP connections."""
+        self._stop_holdings.set()
+        watcher_alive = False
+        t = self._holdings_thread
+        if t is not None:
+            t.join(timeout=5.0)
+            if t.is_alive():
+                # Mid-pass (HTTP/GPT calls, order retries); give it time to finish rather than pull the loggers
+                # and sessions out from under it
+                print("Waiting for holdings watcher to finish its pass...")
+                t.join(timeout=_WATCHER_JOIN_TIMEOUT)
+            watcher_alive = t.is_alive()
+        if self._symbol_pool is not None:
+            self._symbol_pool.shutdown(wait=True)
+            self._symbol_pool = None
+        self._save_state_if_dirty(force=True)
+        if watcher_alive:
+            # The watcher still uses the loggers, sessions and its pool: leave them open (the log workers are
+            # drained at exit) and only flush what has been written so far
+            print(f"Holdings watcher did not stop within {5.0 + _WATCHER_JOIN_TIMEOUT:.0f}s; skipping logger/session teardown")
+            self.decisions_logger.flush()
+            self.logger.flush()
+            return
+        if self._holdings_pool is not None:
+            self._holdings_pool.shutdown(wait=True)
+            self._holdings_pool = None
+        # Log rows are written by background workers; drain them before exit
+        self.decisions_logger.close()
+        self.logger.close()
+        close_sessions()
+
+    def _run(self) -> None:
         self.banner()
-        if self.use_gdelt:
+        # One-shot runs fetch GDELT alongside the first batch; loop mode primes it before the watcher starts
+        if self.use_gdelt and self.loop:
             self._maybe_refresh_gdelt(force=True)
         # Start holdings watcher in loop mode (trade only)
         if self.loop and self.args.trade and self.holdings_watcher and self._holdings_thread is None:
             self._start_holdings_watcher()
         if not self.loop:
+            self._run_scores.clear()
             for i in range(0, len(self.tickers), max(1, self.symbols_per_batch)):
                 batch = self.tickers[i : i + max(1, self.symbols_per_batch)]
-                self._maybe_fetch_batch_prices(batch)
-                # Fetch current positions map once per batch for risk checks
-                pos_map = self._positions_map() if self.args.trade else {}
-                for symbol in batch:
-                    self._process_symbol(symbol, pos_map)
+                # Fetch batch prices and the current positions map (for risk checks) once per batch
+                pos_map = self._prefetch_batch(batch, gdelt=(i == 0), force_gdelt=True)
+                self._process_batch(batch, pos_map, self._is_market_open())
                 if i + self.symbols_per_batch < len(self.tickers):
                     time.sleep(max(0.0, self.batch_sleep_seconds))
-            self._save_state()
+            self._save_state_if_dirty(force=True)
             return
 
         # Looping mode
         while True:
-            if self.use_gdelt:
-                self._maybe_refresh_gdelt()
+            self._run_scores.clear()
+            # Nothing can be priced or traded while closed under market-only price/trade: skip the whole pass
+            market_open = self._is_market_open()
+            if not market_open and self.market_only_trade and self.market_only_price and not self.snapshot_offhours_prices:
+                print(f"Market closed: skipping poll (market-only price/trade); next check in {max(1.0, self.poll_seconds):.0f}s")
+                time.sleep(max(1.0, self.poll_seconds))
+                continue
             for i in range(0, len(self.tickers), max(1, self.symbols_per_batch)):
                 batch = self.tickers[i : i + max(1, self.symbols_per_batch)]
-                self._maybe_fetch_batch_prices(batch)
-                pos_map = self._positions_map() if self.args.trade else {}
-                # If a dedicated holdings watcher runs, skip held symbols here to avoid duplication
+                market_open = self._is_market_open()
+                pos_map = self._prefetch_batch(batch, gdelt=(i == 0))
+                # If a dedicated holdings watcher runs, skip held symbols here to avoid duplication. With
+                # positions unknown (None) the watcher skips its pass too, so the loop keeps every symbol
+                # to still handle exits; new entries are blocked in _process_symbol until positions are known
                 if self.holdings_watcher and pos_map:
                     batch = [s for s in batch if s not in pos_map]
-                for symbol in batch:
-                    self._process_symbol(symbol, pos_map)
+                self._process_batch(batch, pos_map, market_open)
                 if i + self.symbols_per_batch < len(self.tickers):
                     time.sleep(max(0.0, self.batch_sleep_seconds))
-            self._save_state()
+            self._save_state_if_dirty()
             time.sleep(max(1.0, self.poll_seconds))
 
-    def _process_symbol(self, symbol: str, pos_map: Optional[Dict[str, Dict]] = None) -> None:
-        # News fetch cooldown
+    def _process_batch(
+        self, batch: List[str], pos_map: Optional[Dict[str, Dict]] = None, market_open: Optional[bool] = None
+    ) -> None:
+        """Run _process_symbol over a batch, on the symbol pool when symbol_workers > 1."""
+        if market_open is None:
+            market_open = self._is_market_open()
+        if self.symbol_workers <= 1 or len(batch) <= 1:
+            for symbol in batch:
+                self._process_symbol(symbol, pos_map, market_open)
+                self._save_state_if_dirty()
+            return
+        if self._symbol_pool is None:
+            self._symbol_pool = ThreadPoolExecutor(
+                max_workers=min(self.symbol_workers, max(1, self.symbols_per_batch)),
+                thread_name_prefix="nt-symbol",
+            )
+        futures = [self._symbol_pool.submit(self._process_symbol, symbol, pos_map, market_open) for symbol in batch]
+        for fut in futures:
+            try:
+                fut.result()
+            except Exception as e:
+                print(f"  Symbol worker error: {e}")
+            self._save_state_if_dirty()
+
+    def _process_symbol(
+        self, symbol: str, pos_map: Optional[Dict[str, Dict]] = None, market_open: Optional[bool] = None
+    ) -> None:
+        # This symbol's state dict, looked up once; _set_state writes into the same dict
+        sst = self.state.setdefault(symbol, {})
+        # News fetch cooldown: re-score the last fetched items (price/GDELT may have moved) without calling Finnhub
         now_ts = time.time()
-        if self.news_poll_seconds > 0:
-            last_news = self.state.get(symbol, {}).get("last_news", 0)
-            if now_ts - last_news < self.news_poll_seconds:
+        news: Optional[List[Dict]] = None
+        cooldown = self.news_poll_seconds > 0 and now_ts - sst.get("last_news", 0) < self.news_poll_seconds
+        if cooldown:
+            news = (self._news_cache.get(symbol) or {}).get("items")
+            if not isinstance(news, list) or not news:
                 print("-" * 72)
                 print(f"{symbol}: skip (news cooldown {self.news_poll_seconds}s)")
                 return
-
-        # Try local news cache first
-        news = self._get_cached_news(symbol)
+            print(f"{symbol}: news cooldown {self.news_poll_seconds}s, using {len(news)} cached items")
+        else:
+            # Try local news cache first
+            news = self._get_cached_news(symbol)
         if news is None:
             # Respect global rate limiting/backoff before Finnhub call
             self._fh_rate_gate()
@@ -299,7 +465,6 @@ class NewsTrader:
                     self.fh_backoff = self.fh_backoff * max(0.0, min(1.0, self.fh_backoff_decay))
                     if self.fh_backoff < 0.5:
                         self.fh_backoff = 0.0
-                self._fh_mark_call()
                 # Update local cache
                 self._set_cached_news(symbol, news)
             except Exception as e:
@@ -310,17 +475,20 @@ class NewsTrader:
 
         time.sleep(self.args.sleep)
 
-        # Merge GDELT macro events if available
-        if self.use_gdelt and self._gdelt_cache and getattr(self.args, "macro_affects_sentiment", False):
-            news = (news or []) + self._gdelt_cache
+        # Merge GDELT macro events if available; chained lazily, news is only iterated once below
+        news_iter: Iterable[Dict] = news or []
+        if self.use_gdelt and self._gdelt_cache and self.macro_affects_sentiment:
+            news_iter = chain(news_iter, self._gdelt_cache)
 
         # Price (for GPT context and sizing)
-        # Price cooldown and caching
-        price = None
-        market_open = self._is_market_open()
-        if self.price_poll_seconds > 0:
-            last_ts = self.state.get(symbol, {}).get("last_price_ts", 0)
-            last_px = self.state.get(symbol, {}).get("last_price", None)
+        # Price cooldown and caching; market state is normally checked once per batch by the caller
+        if market_open is None:
+            market_open = self._is_market_open()
+        # A price from this batch's snapshot prefetch is used once, in place of a per-symbol quote
+        price = self._take_batch_price(symbol) if self.use_alpaca_data else None
+        if price is None and self.price_poll_seconds > 0:
+            last_ts = sst.get("last_price_ts", 0)
+            last_px = sst.get("last_price", None)
             if last_ts and (time.time() - last_ts) < self.price_poll_seconds and last_px:
                 price = float(last_px)
         if price is None and (market_open or not self.market_only_price):
@@ -335,44 +503,65 @@ class NewsTrader:
                     self.fh_backoff = self.fh_backoff * max(0.0, min(1.0, self.fh_backoff_decay))
                     if self.fh_backoff < 0.5:
                         self.fh_backoff = 0.0
-                self._fh_mark_call()
             except Exception:
                 if self.fh_backoff_enabled:
                     self.fh_backoff = max(self.fh_backoff_start, self.fh_backoff * max(1.0, self.fh_backoff_mult))
-                price = self.state.get(symbol, {}).get("last_price", None)
+                price = sst.get("last_price", None)
         elif price is None and self.market_only_price:
             # Try reuse cached price silently
-            price = self.state.get(symbol, {}).get("last_price", None)
-
-        # Dedupe news items to unique events
-        news = self._dedupe_news(symbol, news)
+            price = sst.get("last_price", None)
 
         vader_scores: List[float] = []
         gpt_scores: List[float] = []
         combined_scores: List[float] = []
-        gpt_details: List[Dict] = []
+        gpt_details: List[Optional[Dict]] = []
 
         # Prepare price history summary for GPT context
         price_ctx = self._update_and_summarize_price_history(symbol, price)
         price_ctx_obj = self._parse_price_ctx(price_ctx) if price_ctx else None
 
         # Per-symbol caches
-        seen_ids = self._get_seen_news(symbol)
         gpt_cache = self._get_gpt_cache(symbol)
         gpt_cache_global = self._get_gpt_cache_global()
+        # Window change is parsed once per symbol by _parse_price_ctx; the GPT guardrail reuses it per item
+        window_chg = price_ctx_obj.get("change_pct") if price_ctx_obj else None
+        window_move_ok = isinstance(window_chg, (int, float)) and abs(window_chg) >= self.gpt_min_window_move_pct
+
+        # VADER scores by event key; re-inserting on use keeps the dict in LRU order for trimming
+        vader_cache = self._vader_cache.setdefault(symbol, {})
+        run_scores = self._run_scores
 
-        for idx, item in enumerate(news):
-            vscore = score_news_vader(self.analyzer, item)
+        # Items that need a fresh GPT call, analyzed together after the loop:
+        # (combined_scores slot, gpt_details slot, vader score, item, event key, text)
+        gpt_pending: List[Tuple[int, int, float, Dict, str, str]] = []
+
+        # One pass: dedupe to unique events, mark them seen, score them
+        seen_keys: set = set()
+        idx = -1
+        for item in news_iter:
+            ekey = self._ekey(item, symbol)
+            if ekey in seen_keys:
+                continue
+            seen_keys.add(ekey)
+            idx += 1
+            self._mark_seen_event(symbol, ekey)
+            # The same event reported for other tickers this pass reuses their VADER score
+            vscore = vader_cache.pop(ekey, None)
+            if vscore is None:
+                vscore = run_scores.get(ekey)
+                if vscore is None:
+                    vscore = score_news_vader(self.analyzer, item)
+            vader_cache[ekey] = vscore
+            run_scores[ekey] = vscore
             vader_scores.append(vscore)
 
             gscore = None
-            if self.gpt_client and idx < max(0, self.args.gpt_max_news):
-                ekey = self._event_key(item, symbol)
+            if self.gpt_client and idx < self.gpt_max_news:
                 cached = None
                 if item.get("is_macro"):
-                    cached = gpt_cache_global.get(ekey)
+                    cached = _lru_get(gpt_cache_global, ekey)
                 if not cached:
-                    cached = gpt_cache.get(ekey) if gpt_cache else None
+                    cached = _lru_get(gpt_cache, ekey) if gpt_cache else None
                 if cached:
                     gpt_details.append(cached)
                     try:
@@ -382,23 +571,7 @@ class NewsTrader:
                         pass
                 else:
                     # Guardrails: only call GPT if VADER strong enough or price moved meaningfully
-                    call_gpt = False
-                    try:
-                        if abs(vscore) >= float(getattr(self.args, "gpt_min_abs_vader", 0.1)):
-                            call_gpt = True
-                    except Exception:
-                        pass
-                    if not call_gpt:
-                        # Parse price_ctx for window change percent if available
-                        try:
-                            if price_ctx and "change=" in price_ctx and "%" in price_ctx:
-                                # e.g., change=+1.23%
-                                frag = price_ctx.split("change=")[1].split("%", 1)[0]
-                                window_chg = float(frag)
-                                if abs(window_chg) >= float(getattr(self.args, "gpt_min_window_move_pct", 0.5)):
-                                    call_gpt = True
-                        except Exception:
-                            pass
+                    call_gpt = abs(vscore) >= self.gpt_min_abs_vader or window_move_ok
                     if not call_gpt:
                         # Skip GPT call; rely on VADER
                         pass
@@ -409,39 +582,64 @@ class NewsTrader:
                             if isinstance(val, str) and val:
                                 parts.append(val)
                         text = ". ".join(parts)
-                        res = gpt_analyze_text(
-                            self.gpt_client,
-                            self.args.gpt_model,
-                            symbol,
-                            text,
-                            price,
-                            price_context=price_ctx,
-                            timeout=self.args.gpt_timeout,
-                        )
-                        if res is not None:
-                            gpt_details.append(res)
-                            self._cache_gpt(symbol, ekey, res)
-                            if item.get("is_macro"):
-                                self._cache_gpt_global(ekey, res)
-                            self._mark_seen_event(symbol, ekey)
-                            try:
-                                gscore = float(res.get("score"))
-                                gpt_scores.append(gscore)
-                            except Exception:
-                                pass
+                        # Placeholder detail keeps gpt_details in item order; filled in below
+                        gpt_pending.append((len(combined_scores), len(gpt_details), vscore, item, ekey, text))
+                        gpt_details.append(None)
 
             if gscore is not None:
-                w = max(0.0, min(1.0, self.args.gpt_weight))
+                w = self.gpt_weight
                 c = (1.0 - w) * vscore + w * gscore
             else:
                 c = vscore
             combined_scores.append(c)
 
+        if gpt_pending:
+            # Each item is an independent OpenAI round-trip; run them concurrently on the shared fan-out pool
+            gpt_results = fetch_many([
+                lambda text=p[5]: gpt_analyze_text(
+                    self.gpt_client,
+                    self.args.gpt_model,
+                    symbol,
+                    text,
+                    price,
+                    price_context=price_ctx,
+                    timeout=self.args.gpt_timeout,
+                )
+                for p in gpt_pending
+            ])
+            w = self.gpt_weight
+            for (ci, di, vscore, item, ekey, _text), res in zip(gpt_pending, gpt_results):
+                if res is None:
+                    continue
+                gpt_details[di] = res
+                self._cache_gpt(symbol, ekey, res)
+                if item.get("is_macro"):
+                    self._cache_gpt_global(ekey, res)
+                try:
+                    gscore = float(res.get("score"))
+                except Exception:
+                    continue
+                gpt_scores.append(gscore)
+                combined_scores[ci] = (1.0 - w) * vscore + w * gscore
+            gpt_details = [d for d in gpt_details if d is not None]
+
+        _trim_lru(vader_cache, self.max_seen_news_per_symbol)
+
         avg_sent = aggregate_sentiment(combined_scores)
         avg_vader = aggregate_sentiment(vader_scores)
         avg_gpt = aggregate_sentiment(gpt_scores)
 
         top_emotions, avg_move, move_dir, gpt_decision = summarize_gpt_details(gpt_details)
+        # Formatted once; shared by the console summary, the decision log and trade log rows
+        emo_parts = [f"{k}:{v}" for k, v in top_emotions]
+        emotions_str = ",".join(emo_parts) if emo_parts else None
+        # Mean GPT confidence, shared by the hybrid decision, the decision log and dynamic brackets
+        avg_conf: Optional[float] = None
+        if gpt_details:
+            try:
+                avg_conf = sum(float(d.get("confidence", 0.0) or 0.0) for d in gpt_details) / len(gpt_details)
+            except Exception:
+                avg_conf = None
 
         # Blend in price-based factors if configured
         used_sent = avg_sent
@@ -450,39 +648,28 @@ class NewsTrader:
             used_sent = (1.0 - self.factor_weight) * avg_sent + self.factor_weight * fscore
 
         # Decide using configured strategy
-        decision_source = "rule"
-        action = decide_action(used_sent, self.args.pos_threshold, self.args.close_threshold)
-        if self.strategy == "gpt" and gpt_decision:
-            action = gpt_decision
-            decision_source = "gpt"
-        elif self.strategy == "hybrid":
-            # Use GPT if available and avg confidence >= threshold
-            if gpt_details:
-                confs = [float(d.get("confidence", 0.0) or 0.0) for d in gpt_details]
-                avg_conf = sum(confs) / len(confs)
-                if gpt_decision and avg_conf >= self.gpt_conf_min:
-                    action = gpt_decision
-                    decision_source = "gpt"
-        else:
-            # rule strategy: optionally override if user explicitly asked to use gpt decision via flag
-            if getattr(self.args, "use_gpt_decision", False) and gpt_decision:
-                action = gpt_decision
-                decision_source = "gpt"
+        action, decision_source = self._decide_fn(used_sent, gpt_decision, avg_conf)
 
-        # Position-aware adjustment: if already holding a long, require stronger negative to exit
+        # Position-aware adjustment: if already holding a long, require stronger negative to exit.
+        # Position qty and entry facts are parsed once and shared by the checks below.
         has_long = False
+        held_pos: Optional[Dict] = None
+        entry_px = 0.0
+        entry_ts = 0.0
         try:
-            if pos_map and symbol in pos_map:
-                qv = float(pos_map.get(symbol, {}).get("qty", 0))
-                has_long = qv > 0
+            held_pos = pos_map.get(symbol) if pos_map else None
+            if held_pos:
+                has_long = float(held_pos.get("qty", 0) or 0) > 0
+            if has_long:
+                entry_px = float(sst.get("last_entry_price", 0) or 0)
+                entry_ts = float(sst.get("last_entry_ts", 0) or 0)
         except Exception:
-            has_long = False
+            pass
 
         # Drawdown/keep-dropping forced close check (only for existing longs)
         dd_forced = False
         try:
             if has_long and self.enable_drawdown_stop and price is not None:
-                entry_px = float(self.state.get(symbol, {}).get("last_entry_price", 0) or 0)
                 if entry_px > 0:
                     drop_pct = ((float(price) - entry_px) / entry_px) * 100.0
                     if drop_pct <= -abs(self.dd_max_drop_pct):
@@ -512,8 +699,7 @@ class NewsTrader:
             try:
                 # Tax-aware holds: if configured, avoid closing too soon unless strongly negative
                 if self.tax_aware:
-                    ent_ts = float(self.state.get(symbol, {}).get("last_entry_ts", 0) or 0)
-                    days_held = (time.time() - ent_ts) / 86400.0 if ent_ts else None
+                    days_held = (time.time() - entry_ts) / 86400.0 if entry_ts else None
                     if days_held is not None:
                         # Minimum hold window
                         if self.tax_min_hold_days > 0 and days_held < self.tax_min_hold_days:
@@ -526,43 +712,33 @@ class NewsTrader:
                         # Require minimum profit to close short-term if configured
                         elif self.tax_min_profit_usd_to_close_short_term > 0:
                             # Approx unrealized PnL = (price - entry_price) * qty (qty unknown here). Use per-share check if available.
-                            try:
-                                entry_px = float(self.state.get(symbol, {}).get("last_entry_price", 0) or 0)
-                                if entry_px > 0 and price is not None:
-                                    pnl_ps = float(price) - entry_px
-                                    if pnl_ps > 0 and pnl_ps < self.tax_min_profit_usd_to_close_short_term:
-                                        action = "hold"
-                                        decision_source += "+tax_hold_minpnl"
-                            except Exception:
-                                pass
-                if action == "close" and used_sent > float(getattr(self, "in_pos_exit_sentiment", -0.05)):
+                            if entry_px > 0 and price is not None:
+                                pnl_ps = float(price) - entry_px
+                                if pnl_ps > 0 and pnl_ps < self.tax_min_profit_usd_to_close_short_term:
+                                    action = "hold"
+                                    decision_source += "+tax_hold_minpnl"
+                if action == "close" and used_sent > self.in_pos_exit_sentiment:
                     action = "hold"
                     decision_source += "+hold_pos"
             except Exception:
                 pass
 
-        print("-" * 72)
+        self._say(0, "-" * 72)
         extra = ""
-        if getattr(self.args, "use_gpt", False):
+        if self.use_gpt:
             extra = f" (vader={avg_vader:+.3f}, gpt={(avg_gpt if gpt_scores else float('nan')):+.3f})"
         # Annotate if factors applied
         if self.factor_weight > 0.0 and isinstance(price_ctx_obj, dict):
             decision_source += "+factors"
-        print(f"{symbol}: sentiment={used_sent:+.3f}{extra} | action={action} | price={price if price else 'n/a'}")
-        if getattr(self.args, "use_gpt", False) and (top_emotions or gpt_details):
-            emo_str = ", ".join([f"{k}:{v}" for k, v in top_emotions]) if top_emotions else "none"
-            print(f"  GPT emotions: {emo_str}")
-            print(f"  GPT exp move: {avg_move:+.2f}% ({move_dir})")
+        self._say(0, "%s: sentiment=%+.3f%s | action=%s | price=%s", symbol, used_sent, extra, action, price if price else "n/a")
+        if self.use_gpt and (top_emotions or gpt_details):
+            self._say(1, "  GPT emotions: %s", ", ".join(emo_parts) if emo_parts else "none")
+            self._say(1, "  GPT exp move: %+.2f%% (%s)", avg_move, move_dir)
             if gpt_decision:
-                print(f"  GPT decision: {gpt_decision}")
+                self._say(1, "  GPT decision: %s", gpt_decision)
 
         # Decision snapshot logging
         try:
-            avg_conf = None
-            if gpt_details:
-                confs = [float(d.get("confidence", 0.0) or 0.0) for d in gpt_details]
-                avg_conf = sum(confs) / len(confs) if confs else None
-            emotions_str = ",".join([f"{k}:{v}" for k, v in top_emotions]) if top_emotions else None
             change_pct = price_ctx_obj.get("change_pct") if isinstance(price_ctx_obj, dict) else None
             vol_pct = price_ctx_obj.get("vol_pct") if isinstance(price_ctx_obj, dict) else None
             trend = price_ctx_obj.get("trend") if isinstance(price_ctx_obj, dict) else None
@@ -585,15 +761,9 @@ class NewsTrader:
         except Exception:
             pass
 
-        # Mark fetched events as seen for GPT reuse
-        for item in news:
-            ekey = self._event_key(item, symbol)
-            self._mark_seen_event(symbol, ekey)
-
         # Order placement
         # Build a base event for logging
         def log_event(side: str, qty: int, order_id: str | None, status: str | None, error: str | None):
-            emotions_str = ",".join([f"{k}:{v}" for k, v in top_emotions]) if top_emotions else None
             # identify environment in log mode
             _mode = (
                 "trade-live" if (self.args.trade and getattr(self, "alpaca_env", "paper") == "live")
@@ -621,6 +791,9 @@ class NewsTrader:
             self.logger.log(ev)
 
         if not self.args.trade:
+            # Dry-run sizing only feeds the console line below; skip it entirely when quiet
+            if self.verbosity < 1:
+                return
             if price and action in ("long", "short"):
                 per_symbol_budget = self._compute_per_symbol_budget(price)
                 qty = max(int(per_symbol_budget // max(price, 0.01)), 1)
@@ -632,21 +805,30 @@ class NewsTrader:
                 elif self.order_size_mode == "shares":
                     want_notional = False
                 else:
-                    want_notional = (action == "long" and side_sim == "buy" and not getattr(self, 'use_bracket', False))
-                if want_notional and side_sim == "buy" and not getattr(self, 'use_bracket', False):
-                    print(f"  DRY-RUN would {action} ${per_symbol_budget:.2f} notional (~{max(1,int(per_symbol_budget//max(price,0.01)))} sh) @ ~{price}")
+                    want_notional = (action == "long" and side_sim == "buy" and not self.use_bracket)
+                if want_notional and side_sim == "buy" and not self.use_bracket:
+                    self._say(1, "  DRY-RUN would %s $%.2f notional (~%s sh) @ ~%s", action, per_symbol_budget, max(1, int(per_symbol_budget // max(price, 0.01))), price)
                 else:
                     if self.order_size_mode == "shares" and self.shares_per_trade > 0:
                         qty = max(1, int(self.shares_per_trade))
-                    print(f"  DRY-RUN would {action} {qty} sh @ ~{price}")
+                    self._say(1, "  DRY-RUN would %s %s sh @ ~%s", action, qty, price)
             elif action == "close":
-                print("  DRY-RUN would close any open position")
+                self._say(1, "  DRY-RUN would close any open position")
             return
 
         if not price:
-            print("  Skip trading: missing price")
+            self._say(1, "  Skip trading: missing price")
             return
 
+        # Risk/PDT knobs read repeatedly below; bind them to locals once
+        pdt_min = self.pdt_min_equity
+        max_pct = self.max_pct_per_symbol
+        max_usd = self.max_usd_per_symbol
+        max_dt = self.max_daytrades_5d
+        use_bracket = self.use_bracket
+        # One wall-clock read for the cooldown, order ids and the persisted trade/bracket timestamps
+        now_ts = time.time()
+
         # Decide order side based on action
         side: Optional[str] = None
         if action == "long":
@@ -655,98 +837,106 @@ class NewsTrader:
             # Enforce long-only: do not open shorts
             if self.long_only:
                 # If we have a long position, interpret as a signal to close; otherwise hold
-                if pos_map and symbol in pos_map and float(pos_map.get(symbol, {}).get("qty", 0)) > 0:
+                if has_long:
                     action = "close"
                     side = None
-                    print("  Long-only: converting short signal to close.")
+                    self._say(1, "  Long-only: converting short signal to close.")
                 else:
-                    print("  Long-only: skipping short signal (holding cash).")
-                    side = None
-                    # fall through to hold/return below
+                    # Nothing to place or close; skip the sizing, PDT and risk work below
+                    self._say(1, "  Long-only: skipping short signal (holding cash).")
+                    return
             else:
                 side = "sell"
         elif action == "close":
             side = None
         else:
-            print("  Hold: no order placed.")
+            self._say(1, "  Hold: no order placed.")
             return
 
-        # Determine order sizing (shares vs dollars) based on mode and constraints
-        per_symbol_budget = self._compute_per_symbol_budget(price)
+        # Order sizing only matters for entries; closes use the position qty
+        per_symbol_budget = notional_amount = 0.0
+        qty = 0
         want_notional = False
-        if self.order_size_mode == "dollars":
-            want_notional = True
-        elif self.order_size_mode == "shares":
-            want_notional = False
-        else:  # auto
-            # Prefer notional for simple market long buys without bracket; otherwise use shares
-            want_notional = (action == "long" and side == "buy" and not getattr(self, 'use_bracket', False))
-
-        # Compute qty and notional candidates
-        notional_amount = per_symbol_budget
-        qty = max(int(per_symbol_budget // max(price, 0.01)), 1)
-        if self.order_size_mode == "shares" and self.shares_per_trade > 0:
-            qty = max(1, int(self.shares_per_trade))
+        if side:
+            # Determine order sizing (shares vs dollars) based on mode and constraints
+            per_symbol_budget = self._compute_per_symbol_budget(price)
+            if self.order_size_mode == "dollars":
+                want_notional = True
+            elif self.order_size_mode == "shares":
+                want_notional = False
+            else:  # auto
+                # Prefer notional for simple market long buys without bracket; otherwise use shares
+                want_notional = (action == "long" and side == "buy" and not use_bracket)
+
+            # Compute qty and notional candidates
+            notional_amount = per_symbol_budget
+            qty = max(int(per_symbol_budget // max(price, 0.01)), 1)
+            if self.order_size_mode == "shares" and self.shares_per_trade > 0:
+                qty = max(1, int(self.shares_per_trade))
 
         # PDT pre-checks (entries): enforce automatically only if equity < threshold
         if side in ("buy", "sell"):
-            acct = self._account_info()
-            try:
-                equity = float(acct.get("equity", 0.0)) if isinstance(acct, dict) else 0.0
-            except Exception:
-                equity = 0.0
-            if equity and equity < self.pdt_min_equity:
+            equity = self._account_equity()
+            if equity and equity < pdt_min:
                 # Estimate recent day trades from local state (last 5 days)
                 dt_count = self._daytrade_count_5d()
-                if side == "buy" and action == "long" and dt_count >= self.max_daytrades_5d:
-                    print(f"  PDT (auto): blocking new entry; {dt_count}/{self.max_daytrades_5d} day trades in 5d and equity ${equity:.2f} < ${self.pdt_min_equity:.2f}")
+                if side == "buy" and action == "long" and dt_count >= max_dt:
+                    self._say(1, "  PDT (auto): blocking new entry; %s/%s day trades in 5d and equity $%.2f < $%.2f", dt_count, max_dt, equity, pdt_min)
                     return
 
         # Trade cooldown for entries (allow close always)
-        now_ts = time.time()
         if side in ("buy", "sell") and self.trade_cooldown_minutes > 0:
-            last_trade = self.state.get(symbol, {}).get("last_trade", 0)
+            last_trade = sst.get("last_trade", 0)
             min_gap = self.trade_cooldown_minutes * 60.0
             if now_ts - last_trade < min_gap:
                 wait = int(min_gap - (now_ts - last_trade))
-                print(f"  Skip trading: cooldown active ({wait}s remaining)")
+                self._say(1, "  Skip trading: cooldown active (%ss remaining)", wait)
                 return
 
         if side:
+            # A None map while trading means /positions failed: the open-count and exposure caps cannot be
+            # checked, so fail closed and place no new entries until positions are known again
+            if pos_map is None and self.args.trade and action in ("long", "short"):
+                self._say(0, "  Risk: open positions unavailable; skipping new %s entry", action)
+                return
             # Risk checks if positions map provided
             if pos_map is not None and self.args.trade:
+                # held_pos is this symbol's entry in pos_map, looked up once with has_long
                 open_count = len(pos_map)
-                if action in ("long", "short") and symbol not in pos_map and open_count >= self.max_open_positions:
-                    print(f"  Risk: max open positions reached ({open_count}/{self.max_open_positions})")
+                if action in ("long", "short") and held_pos is None and open_count >= self.max_open_positions:
+                    self._say(1, "  Risk: max open positions reached (%s/%s)", open_count, self.max_open_positions)
                     return
-                p = pos_map.get(symbol)
-                current_usd = abs(float(p.get("market_value", 0))) if p else 0.0
-                new_usd = (float(notional_amount) if (action == "long" and side == "buy" and want_notional and not getattr(self, 'use_bracket', False)) else (qty * float(price)))
+                current_usd = abs(float(held_pos.get("market_value", 0))) if held_pos else 0.0
+                new_usd = (float(notional_amount) if (action == "long" and side == "buy" and want_notional and not use_bracket) else (qty * float(price)))
                 if True:
                     # Enforce per-symbol exposure cap (percent-of-equity when configured; else fixed USD)
-                    cap_usd = self.max_usd_per_symbol
-                    if self.max_pct_per_symbol > 0.0 and equity > 0:
-                        cap_usd = self.max_pct_per_symbol * equity
+                    cap_usd = max_usd
+                    if max_pct > 0.0 and equity > 0:
+                        cap_usd = max_pct * equity
                     if (current_usd + new_usd) > cap_usd:
-                        if self.max_pct_per_symbol > 0.0 and equity > 0:
-                            print(
-                                f"  Risk: per-symbol cap {self.max_pct_per_symbol*100:.2f}% of equity exceeded (current ${current_usd:.2f} + new ${new_usd:.2f} > ${cap_usd:.2f})"
+                        if max_pct > 0.0 and equity > 0:
+                            self._say(
+                                1,
+                                "  Risk: per-symbol cap %.2f%% of equity exceeded (current $%.2f + new $%.2f > $%.2f)",
+                                max_pct * 100, current_usd, new_usd, cap_usd,
                             )
                         else:
-                            print(
-                                f"  Risk: per-symbol USD limit exceeded (current ${current_usd:.2f} + new ${new_usd:.2f} > ${self.max_usd_per_symbol:.2f})"
+                            self._say(
+                                1,
+                                "  Risk: per-symbol USD limit exceeded (current $%.2f + new $%.2f > $%.2f)",
+                                current_usd, new_usd, max_usd,
                             )
                         return
 
-            if self.market_only_trade and not self._is_market_open():
-                print("  Market closed: skipping order per config (market-only-trade)")
+            if self.market_only_trade and not market_open:
+                self._say(1, "  Market closed: skipping order per config (market-only-trade)")
                 return
 
             # Optional bracket order (tactical leg defaults)
             order_class = None
             tp = None
             sl = None
-            if getattr(self, 'use_bracket', False):
+            if use_bracket:
                 # Determine TP/SL percentages (static or dynamic per symbol)
                 tp_pct_use = max(0.0, float(self.tp_pct))
                 sl_pct_use = max(0.0, float(self.sl_pct))
@@ -754,19 +944,8 @@ class NewsTrader:
                 sl_price = None
                 if self.dynamic_bracket:
                     # Prefer GPT expected move when available; fallback to sentiment magnitude mapping
-                    exp_move_pct = None
-                    avg_conf = None
-                    try:
-                        # avg_move defined earlier when summarizing GPT details
-                        exp_move_pct = abs(float(avg_move)) if 'avg_move' in locals() else None
-                    except Exception:
-                        exp_move_pct = None
-                    try:
-                        if gpt_details:
-                            confs = [float(d.get("confidence", 0.0) or 0.0) for d in gpt_details]
-                            avg_conf = sum(confs) / len(confs) if confs else None
-                    except Exception:
-                        avg_conf = None
+                    # avg_move and avg_conf come from the GPT summary above
+                    exp_move_pct = abs(avg_move)
 
                     if exp_move_pct and exp_move_pct > 0:
                         tp_pct_use = exp_move_pct / 100.0  # convert percent -> decimal
@@ -775,7 +954,7 @@ class NewsTrader:
                             tp_pct_use *= (0.5 + 0.5 * max(0.0, min(1.0, float(avg_conf))))
                     else:
                         # Map sentiment magnitude [0..1] into [tp_pct_min..tp_pct_max]
-                        mag = max(0.0, min(1.0, abs(float(avg_sent)))) if 'avg_sent' in locals() else 0.0
+                        mag = max(0.0, min(1.0, abs(avg_sent)))
                         tp_pct_use = self.tp_pct_min + (self.tp_pct_max - self.tp_pct_min) * mag
 
                     # Clamp within configured bounds
@@ -785,11 +964,9 @@ class NewsTrader:
                     sl_suggest = tp_pct_use / rr
                     sl_pct_use = max(self.sl_pct_min, min(self.sl_pct_max, sl_suggest))
 
-                    try:
+                    if self.verbosity >= 1:
                         rr_eff = (tp_pct_use / sl_pct_use) if sl_pct_use > 0 else float('inf')
-                        print(f"  Dynamic bracket: tp={tp_pct_use*100:.2f}%, sl={sl_pct_use*100:.2f}% (RR~{rr_eff:.1f}x)")
-                    except Exception:
-                        pass
+                        self._say(1, "  Dynamic bracket: tp=%.2f%%, sl=%.2f%% (RR~%.1fx)", tp_pct_use * 100, sl_pct_use * 100, rr_eff)
 
                 if action == "long":
                     tp_price = round(price * (1 + max(0.0, tp_pct_use)), 2)
@@ -811,12 +988,14 @@ class NewsTrader:
                         "entry_price": float(price) if price is not None else None,
                         "side": side,
                         "qty": int(qty),
-                        "ts": time.time(),
+                        "ts": now_ts,
                     }
-                    self._save_state()
+                    self._state_dirty = True
                 except Exception:
                     pass
 
+            # Client order ids share one prefix per symbol pass
+            oid_base = self._OID_BASE_TMPL.format(sym=symbol, ts=int(now_ts))
             # Dual-horizon split (core + tactical) for long entries
             if self.dual_horizon and action == "long" and side == "buy":
                 core_budget = per_symbol_budget * self.core_allocation_pct
@@ -826,23 +1005,37 @@ class NewsTrader:
                 if core_qty + tact_qty <= 0:
                     tact_qty = max(1, int(per_symbol_budget // max(price, 0.01)))
                     core_qty = 0
-                # Core leg (larger bracket)
+                # Core leg (larger bracket) and tactical leg are independent orders; submit them concurrently
+                legs: List[Callable[[], Dict]] = []
                 if self.core_use_bracket and core_qty > 0:
                     core_tp = round(price * (1 + max(0.0, self.core_tp_pct)), 2)
                     core_sl = round(price * (1 - max(0.0, self.core_sl_pct)), 2)
-                    core_oid = f"nt-{symbol}-{int(time.time())}-buy-core-{core_qty}"
-                    resp1 = alpaca_place_order(
+                    core_oid = self._OID_LEG_TMPL.format(base=oid_base, side="buy", tag="core", qty=core_qty)
+                    legs.append(lambda: alpaca_place_order(
                         self.alpaca_url, self.alpaca_key, self.alpaca_secret, symbol,
                         core_qty, "buy", type_="market", tif="day", client_order_id=core_oid,
                         order_class="bracket", take_profit={"limit_price": core_tp}, stop_loss={"stop_price": core_sl}
-                    )
+                    ))
+                if tact_qty > 0:
+                    tact_oid = self._OID_LEG_TMPL.format(base=oid_base, side="buy", tag="tact", qty=tact_qty)
+                    tact_bracket = {"order_class": "bracket", "take_profit": tp, "stop_loss": sl} if use_bracket else {}
+                    legs.append(lambda: alpaca_place_order(
+                        self.alpaca_url, self.alpaca_key, self.alpaca_secret, symbol,
+                        tact_qty, "buy", type_="market", tif="day", client_order_id=tact_oid,
+                        **tact_bracket
+                    ))
+                # A leg that raises becomes an error response, so the other leg's result is still logged and recorded
+                resps = iter(fetch_many([lambda leg=leg: _order_or_error(leg) for leg in legs]))
+                resp1 = next(resps) if self.core_use_bracket and core_qty > 0 else None
+                resp2 = next(resps) if tact_qty > 0 else None
+                if resp1 is not None:
                     if resp1.get("status") == "error":
                         msg = f"{resp1.get('code')} {resp1.get('message')}"
-                        print(f"  Core order error: {msg}")
+                        self._say(0, "  Core order error: %s", msg)
                         log_event("buy", core_qty, None, "error", msg)
                     else:
                         oid1 = resp1.get("id") or resp1.get("client_order_id")
-                        print(f"  Placed core buy: qty={core_qty}, id={oid1}")
+                        self._say(0, "  Placed core buy: qty=%s, id=%s", core_qty, oid1)
                         log_event("buy", core_qty, str(oid1), "placed", None)
                         try:
                             sym = self.state.setdefault(symbol, {})
@@ -854,32 +1047,20 @@ class NewsTrader:
                                 "entry_price": float(price),
                                 "side": "buy",
                                 "qty": int(core_qty),
-                                "ts": time.time(),
+                                "ts": now_ts,
                             }
-                            self._save_state()
+                            self._state_dirty = True
                         except Exception:
                             pass
                 # Tactical leg
-                if tact_qty > 0:
-                    tact_oid = f"nt-{symbol}-{int(time.time())}-buy-tact-{tact_qty}"
-                    if getattr(self, 'use_bracket', False):
-                        resp2 = alpaca_place_order(
-                            self.alpaca_url, self.alpaca_key, self.alpaca_secret, symbol,
-                            tact_qty, "buy", type_="market", tif="day", client_order_id=tact_oid,
-                            order_class="bracket", take_profit=tp, stop_loss=sl
-                        )
-                    else:
-                        resp2 = alpaca_place_order(
-                            self.alpaca_url, self.alpaca_key, self.alpaca_secret, symbol,
-                            tact_qty, "buy", type_="market", tif="day", client_order_id=tact_oid
-                        )
+                if resp2 is not None:
                     if resp2.get("status") == "error":
                         msg = f"{resp2.get('code')} {resp2.get('message')}"
-                        print(f"  Tactical order error: {msg}")
+                        self._say(0, "  Tactical order error: %s", msg)
                         log_event("buy", tact_qty, None, "error", msg)
                     else:
                         oid2 = resp2.get("id") or resp2.get("client_order_id")
-                        print(f"  Placed tactical buy: qty={tact_qty}, id={oid2}")
+                        self._say(0, "  Placed tactical buy: qty=%s, id=%s", tact_qty, oid2)
                         log_event("buy", tact_qty, str(oid2), "placed", None)
                         try:
                             sym = self.state.setdefault(symbol, {})
@@ -891,17 +1072,19 @@ class NewsTrader:
                                 "entry_price": float(price),
                                 "side": "buy",
                                 "qty": int(tact_qty),
-                                "ts": time.time(),
+                                "ts": now_ts,
                             }
-                            self._save_state()
+                            self._state_dirty = True
                         except Exception:
                             pass
-                self._set_state(symbol, "last_trade", time.time())
+                # sst is this symbol's state dict; now_ts is already a float
+                sst["last_trade"] = now_ts
+                self._state_dirty = True
                 # PDT/Tax bookkeeping for entries
                 self._record_entry(symbol, price)
             else:
-                client_oid = f"nt-{symbol}-{int(time.time())}-{side}-{qty}"
-                use_notional = bool(want_notional and not getattr(self, 'use_bracket', False) and side == "buy")
+                client_oid = self._OID_TMPL.format(base=oid_base, side=side, qty=qty)
+                use_notional = bool(want_notional and not use_bracket and side == "buy")
                 resp = alpaca_place_order(
                     self.alpaca_url,
                     self.alpaca_key,
@@ -919,48 +1102,48 @@ class NewsTrader:
                 )
                 if resp.get("status") == "error":
                     msg = f"{resp.get('code')} {resp.get('message')}"
-                    print(f"  Order error: {msg}")
+                    self._say(0, "  Order error: %s", msg)
                     log_event(side, qty, None, "error", msg)
                 else:
                     oid = resp.get("id") or resp.get("client_order_id")
-                    print(f"  Placed {side} order: qty={qty}, id={oid}")
+                    self._say(0, "  Placed %s order: qty=%s, id=%s", side, qty, oid)
                     log_event(side, qty, str(oid), "placed", None)
-                    self._set_state(symbol, "last_trade", time.time())
+                    sst["last_trade"] = now_ts
+                    self._state_dirty = True
                     if side == "buy" and action == "long":
                         self._record_entry(symbol, price)
         elif action == "close":
-            # Positions-aware close
-            pos = alpaca_position_for_symbol(self.alpaca_url, self.alpaca_key, self.alpaca_secret, symbol)
+            # Positions-aware close; the batch positions map answers this without another GET when it has the
+            # symbol. A miss may just mean the /positions fetch failed, so confirm with the per-symbol lookup.
+            pos = pos_map.get(symbol.upper()) if pos_map else None
+            if not pos:
+                pos = alpaca_position_for_symbol(self.alpaca_url, self.alpaca_key, self.alpaca_secret, symbol)
             if not pos:
-                print("  No open position to close")
+                self._say(1, "  No open position to close")
                 return
             qty_pos = abs(int(float(pos.get("qty", 0))))
             if qty_pos <= 0:
-                print("  No open position to close")
+                self._say(1, "  No open position to close")
                 return
             # PDT close check: auto-enforce only if equity < threshold
-            acct = self._account_info()
-            try:
-                equity = float(acct.get("equity", 0.0)) if isinstance(acct, dict) else 0.0
-            except Exception:
-                equity = 0.0
-            if equity and equity < self.pdt_min_equity:
+            equity = self._account_equity()
+            if equity and equity < pdt_min:
                 if self._would_be_daytrade(symbol):
                     dt_count = self._daytrade_count_5d()
-                    if dt_count >= self.max_daytrades_5d and not self.pdt_allow_risk_exit:
-                        print(f"  PDT (auto): blocking close to avoid new day trade; {dt_count}/{self.max_daytrades_5d} in 5d and equity ${equity:.2f} < ${self.pdt_min_equity:.2f}")
+                    if dt_count >= max_dt and not self.pdt_allow_risk_exit:
+                        self._say(1, "  PDT (auto): blocking close to avoid new day trade; %s/%s in 5d and equity $%.2f < $%.2f", dt_count, max_dt, equity, pdt_min)
                         return
-            if self.market_only_trade and not self._is_market_open():
-                print("  Market closed: skipping close per config (market-only-trade)")
+            if self.market_only_trade and not market_open:
+                self._say(1, "  Market closed: skipping close per config (market-only-trade)")
                 return
             resp = alpaca_close_position(self.alpaca_url, self.alpaca_key, self.alpaca_secret, symbol, str(qty_pos))
             if resp.get("status") == "error":
                 msg = f"{resp.get('code', '')} {resp.get('message', '')}".strip()
-                print(f"  Close error: {msg}")
+                self._say(0, "  Close error: %s", msg)
                 log_event("none", qty_pos, None, "error", msg)
             else:
                 oid = resp.get("id") or resp.get("order_id") or "close"
-                print(f"  Close placed for {qty_pos} sh, id={oid}")
+                self._say(0, "  Close placed for %s sh, id=%s", qty_pos, oid)
                 log_event("none", qty_pos, str(oid), "placed", None)
                 # Clear stored bracket expectation since position is closing
                 try:
@@ -971,85 +1154,107 @@ class NewsTrader:
                         del sym["last_bracket_core"]
                     if "last_bracket_tactical" in sym:
                         del sym["last_bracket_tactical"]
-                    self._save_state()
+                    self._state_dirty = True
                 except Exception:
                     pass
                 # PDT/Tax bookkeeping for exits
                 self._record_exit(symbol, price)
 
+    def _say(self, level: int, msg: str, *args: Any) -> None:
+        """print(msg % args) when verbosity >= level; suppressed lines are never formatted."""
+        if level > self.verbosity:
+            return
+        print(msg % args if args else msg)
+
     # --- state helpers ---
     def _load_state(self) -> Dict[str, Dict[str, float]]:
         try:
             with self._state_io_lock:
                 if self.state_path.exists():
-                    with self.state_path.open("r", encoding="utf-8") as f:
-                        data = json.load(f)
+                    data = loads_json(self.state_path.read_bytes())
                     if isinstance(data, dict):
                         return data
         except Exception:
             pass
         return {}
 
+    def _save_state_if_dirty(self, force: bool = False) -> None:
+        """Save state if it changed. Unforced saves are rate-limited and written on a background thread."""
+        if not self._state_dirty:
+            return
+        if force:
+            t = self._save_thread
+            if t is not None:
+                t.join()
+            self._save_state()
+            self._last_save_ts = time.monotonic()
+            return
+        now = time.monotonic()
+        if now - self._last_save_ts < max(30.0, self.poll_seconds):
+            return
+        t = self._save_thread
+        if t is not None and t.is_alive():
+            return
+        self._last_save_ts = now
+        self._save_thread = threading.Thread(target=self._save_state, name="state-writer", daemon=True)
+        self._save_thread.start()
+
     def _save_state(self) -> None:
         try:
-            with self._state_io_lock:
-                # Trim per-symbol caches to avoid unbounded growth
-                max_seen = getattr(self, "max_seen_news_per_symbol", 500)
-                for sym, sdict in list(self.state.items()):
-                    if not isinstance(sdict, dict):
-                        continue
-                    if "seen_news" in sdict and isinstance(sdict["seen_news"], list):
-                        if len(sdict["seen_news"]) > max_seen:
-                            sdict["seen_news"] = sdict["seen_news"][-max_seen:]
-                    if "seen_events" in sdict and isinstance(sdict.get("seen_events"), list):
-                        if len(sdict["seen_events"]) > max_seen:
-                            sdict["seen_events"] = sdict["seen_events"][-max_seen:]
-                    if "price_series" in sdict and isinstance(sdict.get("price_series"), list):
-                        pts = getattr(self, "price_history_points", 10)
-                        if len(sdict["price_series"]) > pts:
-                            sdict["price_series"] = sdict["price_series"][-pts:]
-                with self.state_path.open("w", encoding="utf-8") as f:
-                    json.dump(self.state, f)
+            # _state_write_lock keeps concurrent savers in snapshot order; _state_io_lock is only
+            # held while taking the snapshot, so state writers never wait on disk I/O
+            with self._state_write_lock:
+                with self._state_io_lock:
+                    self._state_dirty = False
+                    # Seen lists live in bounded deques between saves; copy them back for serialization.
+                    # Every other list is already capped by the code that appends to it.
+                    for (sym, field), (_, dq) in list(self._seen.items()):
+                        self.state.setdefault(sym, {})[field] = list(dq)
+                    for sym, series in list(self._price_series.items()):
+                        self.state.setdefault(sym, {})["price_series"] = list(series)
+                    # Serialize first so a concurrent mutation aborts the save instead of truncating the file
+                    payload = dumps_json(self.state)
+                # Write a sibling temp file and swap it in, so a crash never leaves a partial state file
+                tmp_path = self.state_path.with_name(self.state_path.name + ".tmp")
+                with tmp_path.open("wb") as f:
+                    f.write(payload)
+                os.replace(tmp_path, self.state_path)
         except Exception:
-            pass
+            self._state_dirty = True
 
     def _set_state(self, symbol: str, key: str, value: float) -> None:
-        if symbol not in self.state:
-            self.state[symbol] = {}
-        self.state[symbol][key] = float(value)
+        # Symbol workers and the holdings watcher write concurrently with _save_state
+        with self._state_io_lock:
+            if symbol not in self.state:
+                self.state[symbol] = {}
+            self.state[symbol][key] = float(value)
+            self._state_dirty = True
 
     # ---- caching helpers ----
-    def _news_id(self, item: Dict) -> str:
-        base = str(item.get("id") or "")
-        if base:
-            return base
-        raw = f"{item.get('source','')}|{item.get('datetime','')}|{item.get('headline','')}".encode("utf-8", errors="ignore")
-        return hashlib.sha1(raw).hexdigest()
-
-    def _get_seen_news(self, symbol: str) -> set:
-        arr = self.state.get(symbol, {}).get("seen_news", [])
-        return set(arr) if isinstance(arr, list) else set()
-
-    def _mark_seen_news(self, symbol: str, news_id: str) -> None:
-        sym = self.state.setdefault(symbol, {})
-        arr = sym.setdefault("seen_news", [])
-        if news_id not in arr:
-            arr.append(news_id)
-        # Trim size
-        if len(arr) > self.max_seen_news_per_symbol:
-            del arr[: len(arr) - self.max_seen_news_per_symbol]
+    def _seen_store(self, symbol: str, field: str) -> Tuple[set, Deque[str]]:
+        store = self._seen.get((symbol, field))
+        if store is None:
+            arr = self.state.get(symbol, {}).get(field)
+            # dict.fromkeys drops duplicates from older state files while keeping insertion order
+            dq: Deque[str] = deque(dict.fromkeys(arr) if isinstance(arr, list) else (), maxlen=max(0, self.max_seen_news_per_symbol))
+            store = self._seen.setdefault((symbol, field), (set(dq), dq))
+        return store
+
+    def _mark_seen(self, symbol: str, field: str, key: str) -> None:
+        seen, dq = self._seen_store(symbol, field)
+        if key in seen or not dq.maxlen:
+            return
+        if len(dq) == dq.maxlen:
+            seen.discard(dq[0])
+        dq.append(key)
+        seen.add(key)
+        self._state_dirty = True
 
     def _get_seen_events(self, symbol: str) -> set:
-        arr = self.state.get(symbol, {}).get("seen_events", [])
-        return set(arr) if isinstance(arr, list) else set()
+        return self._seen_store(symbol, "seen_events")[0]
 
     def _mark_seen_event(self, symbol: str, ekey: str) -> None:
-        sym = self.state.setdefault(symbol, {})
-        arr = sym.setdefault("seen_events", [])
-        if ekey not in arr:
-            arr.append(ekey)
-        if len(arr) > self.max_seen_news_per_symbol:
-            del arr[: len(arr) - self.max_seen_news_per_symbol]
+        self._mark_seen(symbol, "seen_events", ekey)
 
     def _get_gpt_cache(self, symbol: str) -> Dict[str, Dict]:
         sym = self.state.setdefault(symbol, {})
@@ -1059,6 +1264,8 @@ class NewsTrader:
     def _cache_gpt(self, symbol: str, news_id: str, data: Dict) -> None:
         cache = self._get_gpt_cache(symbol)
         cache[news_id] = data
+        _trim_lru(cache, self.max_seen_news_per_symbol)
+        self._state_dirty = True
 
     def _get_gpt_cache_global(self) -> Dict[str, Dict]:
         g = self.state.setdefault("__global__", {})
@@ -1068,43 +1275,48 @@ class NewsTrader:
     def _cache_gpt_global(self, key: str, data: Dict) -> None:
         cache = self._get_gpt_cache_global()
         cache[key] = data
+        _trim_lru(cache, 4 * self.max_seen_news_per_symbol)
+        self._state_dirty = True
 
     # ---- price history ----
+    def _price_series_for(self, symbol: str) -> Deque[Dict[str, float]]:
+        series = self._price_series.get(symbol)
+        if series is None:
+            arr = self.state.get(symbol, {}).get("price_series")
+            points = (p for p in arr if isinstance(p, dict)) if isinstance(arr, list) else ()
+            series = self._price_series.setdefault(symbol, deque(points, maxlen=max(1, self.price_hist_points)))
+        return series
+
     def _update_and_summarize_price_history(self, symbol: str, price: Optional[float]) -> Optional[str]:
         if price is None:
             return None
-        sym = self.state.setdefault(symbol, {})
-        series: List[Dict[str, float]] = sym.setdefault("price_series", [])
+        # Bounded to the newest price_hist_points; appending evicts the oldest point
+        series = self._price_series_for(symbol)
         now = time.time()
         series.append({"ts": now, "price": float(price)})
         cutoff = now - self.price_hist_window_min * 60.0
-        series[:] = [p for p in series if p.get("ts", 0) >= cutoff]
-        # Downsample
-        if len(series) > self.price_hist_points:
-            step = max(1, len(series) // self.price_hist_points)
-            series[:] = series[::step][: self.price_hist_points]
-        sym["price_series"] = series
+        # Points are appended in time order, so expired ones sit at the left end
+        while series and series[0].get("ts", 0) < cutoff:
+            series.popleft()
+        self._state_dirty = True
         if len(series) < 2:
             return None
-        first = series[0]["price"]
-        last = series[-1]["price"]
+        # Pull the prices out once; everything below works on the flat list
+        px = [p["price"] for p in series]
+        first = px[0]
+        last = px[-1]
         window_chg = ((last - first) / first) * 100.0 if first else 0.0
         # simple volatility: stddev of successive returns
-        rets: List[float] = []
-        for i in range(1, len(series)):
-            p0 = series[i - 1]["price"]
-            p1 = series[i]["price"]
-            if p0:
-                rets.append((p1 - p0) / p0)
+        rets = [(p1 - p0) / p0 for p0, p1 in zip(px, px[1:]) if p0]
         if not rets:
             vol_pct = 0.0
         else:
             mean = sum(rets) / len(rets)
             var = sum((r - mean) ** 2 for r in rets) / len(rets)
             vol_pct = (var ** 0.5) * 100.0
-        slope = (last - first) / max(1, len(series) - 1)
+        slope = (last - first) / max(1, len(px) - 1)
         trend = "up" if slope > 0 else ("down" if slope < 0 else "flat")
-        prices = [round(p["price"], 2) for p in series]
+        prices = [round(p, 2) for p in px]
         return f"window={self.price_hist_window_min}m, points={len(series)}, change={window_chg:+.2f}%, vol~{vol_pct:.2f}%, trend={trend}, series={prices}"
 
     def _price_stats_for_window(self, symbol: str, window_min: float) -> Optional[Dict[str, float]]:
@@ -1113,36 +1325,38 @@ class NewsTrader:
         Returns dict with keys: change_pct, downs, points. None if insufficient data.
         """
         try:
-            sym = self.state.get(symbol, {})
-            series = sym.get("price_series")
-            if not isinstance(series, list) or len(series) < 2:
+            series = self._price_series_for(symbol)
+            if len(series) < 2:
                 return None
             now = time.time()
             cutoff = now - max(1.0, float(window_min)) * 60.0
-            seg = [p for p in series if isinstance(p, dict) and (p.get("ts", 0) >= cutoff)]
-            if len(seg) < 2:
+            # One pass over the in-window points: endpoints, count and longest run of consecutive lower prices
+            first = prev = 0.0
+            n = downs = cur = 0
+            for p in islice(series, _window_start(series, cutoff), None):
+                if not isinstance(p, dict):
+                    continue
+                px = float(p.get("price", 0) or 0)
+                if not n:
+                    first = px
+                elif px < prev:
+                    cur += 1
+                    if cur > downs:
+                        downs = cur
+                else:
+                    cur = 0
+                prev = px
+                n += 1
+            if n < 2:
                 return None
-            first = float(seg[0].get("price", 0) or 0)
-            last = float(seg[-1].get("price", 0) or 0)
-            change_pct = ((last - first) / first) * 100.0 if first else 0.0
-            downs = 0
-            cur = 0
-            for i in range(1, len(seg)):
-                try:
-                    if float(seg[i].get("price", 0) or 0) < float(seg[i-1].get("price", 0) or 0):
-                        cur += 1
-                    else:
-                        cur = 0
-                    downs = max(downs, cur)
-                except Exception:
-                    pass
-            return {"change_pct": change_pct, "downs": float(downs), "points": float(len(seg))}
+            change_pct = ((prev - first) / first) * 100.0 if first else 0.0
+            return {"change_pct": change_pct, "downs": float(downs), "points": float(n)}
         except Exception:
             return None
 
     # ---- GDELT refresh ----
     def _maybe_refresh_gdelt(self, force: bool = False) -> None:
-        now = time.time()
+        now = time.monotonic()
         if not self.use_gdelt:
             return
         if not force and (now - self._gdelt_last_ts) < max(1.0, self.gdelt_poll_seconds):
@@ -1156,17 +1370,24 @@ class NewsTrader:
 
     # ---- market hours ----
     def _is_market_open(self) -> bool:
+        """Market-hours check. The Alpaca clock is already TTL-cached by alpaca_clock, so it is not memoized
+        again here (that would stack the staleness); only the local-time fallback is memoized, for 30s."""
         # Prefer Alpaca clock when trade creds available
         if self.alpaca_url and self.alpaca_key and self.alpaca_secret:
             clk = alpaca_clock(self.alpaca_url, self.alpaca_key, self.alpaca_secret)
             if isinstance(clk, dict) and isinstance(clk.get("is_open"), bool):
                 return bool(clk.get("is_open"))
-        # Fallback: local clock in specified timezone, Mon-Fri 09:30-16:00
-        try:
-            from zoneinfo import ZoneInfo
-            tz = ZoneInfo(self.market_tz)
-        except Exception:
-            tz = None
+        now = time.monotonic()
+        cached = self._mkt_open_cache
+        if cached is not None and now - cached[0] < 30.0:
+            return cached[1]
+        is_open = self._local_market_open()
+        self._mkt_open_cache = (now, is_open)
+        return is_open
+
+    def _local_market_open(self) -> bool:
+        # Local clock in specified timezone, Mon-Fri 09:30-16:00
+        tz = self._market_zone
         now_local = datetime.now(tz) if tz else datetime.now()
         # Monday=0..Sunday=6
         if now_local.weekday() >= 5:
@@ -1179,7 +1400,7 @@ class NewsTrader:
     # ---- Finnhub global rate limiting ----
     def _fh_rate_gate(self) -> None:
         with self._fh_lock:
-            now = time.time()
+            now = time.monotonic()
             # Enforce min interval + small jitter to avoid burst alignment
             if self.fh_min_interval > 0 and self._fh_last_call_ts > 0:
                 dt = now - self._fh_last_call_ts
@@ -1195,36 +1416,49 @@ class NewsTrader:
             if self.fh_max_rpm and self.fh_max_rpm > 0:
                 window = 60.0
                 # Drop old
-                self._fh_call_times = [t for t in self._fh_call_times if now - t < window]
-                if len(self._fh_call_times) >= self.fh_max_rpm:
-                    earliest = min(self._fh_call_times) if self._fh_call_times else now
+                calls = self._fh_call_times
+                while calls and now - calls[0] >= window:
+                    calls.popleft()
+                if len(calls) >= self.fh_max_rpm:
+                    earliest = calls[0]
                     sleep_for = window - (now - earliest) + 0.05
                     if sleep_for > 0:
                         time.sleep(sleep_for)
             # Also respect backoff if active
             if hasattr(self, 'fh_backoff_enabled') and self.fh_backoff_enabled and self.fh_backoff > 0:
                 time.sleep(min(self.fh_backoff, getattr(self, 'fh_backoff_max', self.fh_backoff)))
+            # Reserve this slot while still holding the lock: concurrent callers count it against the RPM
+            # window and measure their interval from here, before the request is even sent
+            stamp = time.monotonic()
+            self._fh_last_call_ts = stamp
+            self._fh_call_times.append(stamp)
 
-    def _fh_mark_call(self) -> None:
-        with self._fh_lock:
-            now = time.time()
-            self._fh_last_call_ts = now
-            self._fh_call_times.append(now)
+    def _prefetch_batch(self, batch: List[str], gdelt: bool = False, force_gdelt: bool = False) -> Optional[Dict[str, Dict]]:
+        """Refresh batch prices, the positions map (when trading) and optionally GDELT concurrently.
 
-    def _positions_map(self) -> Dict[str, Dict]:
+        Returns the positions map ({} in dry-run, None when the positions fetch failed).
+        """
+        # Prices go first: fetch_many runs the first call on this thread, so the snapshot chunks and
+        # Finnhub fallback it fans out still run concurrently instead of inline in a pool worker
+        calls: List[Callable[[], Any]] = [lambda: self._maybe_fetch_batch_prices(batch)]
+        if self.args.trade:
+            calls.append(self._positions_map)
+        if gdelt and self.use_gdelt:
+            calls.append(lambda: self._maybe_refresh_gdelt(force=force_gdelt))
+        results = fetch_many(calls)
+        return results[1] if self.args.trade else {}
+
+    def _positions_map(self) -> Optional[Dict[str, Dict]]:
+        """Open positions by symbol, or None when they could not be fetched (callers then fall back
+        to per-symbol lookups). The map is shared with the positions cache; do not modify it."""
         try:
-            pos = alpaca_positions(self.alpaca_url, self.alpaca_key, self.alpaca_secret)
-            out: Dict[str, Dict] = {}
-            for p in pos:
-                sym = str(p.get("symbol", "")).upper()
-                out[sym] = p
-            return out
+            return alpaca_positions_map(self.alpaca_url, self.alpaca_key, self.alpaca_secret)
         except Exception:
-            return {}
+            return None
 
     def _account_info(self) -> Dict:
         """Cached account info with equity and PDT flags when available."""
-        now = time.time()
+        now = time.monotonic()
         ts = self._acct_cache.get("ts", 0.0)
         if now - ts < 30.0 and "acct" in self._acct_cache:
             return self._acct_cache.get("acct", {})  # type: ignore[return-value]
@@ -1236,9 +1470,19 @@ class NewsTrader:
                 self._acct_cache["bp"] = float(acct.get("buying_power", 0.0))
             except Exception:
                 pass
+            try:
+                self._acct_cache["equity"] = float(acct.get("equity", 0.0))
+            except Exception:
+                self._acct_cache["equity"] = 0.0
             return acct
         return {}
 
+    def _account_equity(self) -> float:
+        """Account equity parsed once per _account_info refresh (0.0 when unavailable)."""
+        if not self._account_info():
+            return 0.0
+        return float(self._acct_cache.get("equity", 0.0))
+
     # ---- holdings watcher thread ----
     def _start_holdings_watcher(self) -> None:
         if self._holdings_thread is not None:
@@ -1247,16 +1491,15 @@ class NewsTrader:
             while not self._stop_holdings.is_set():
                 try:
                     pos_map = self._positions_map()
-                    symbols = list(pos_map.keys())
+                    symbols = list(pos_map.keys()) if pos_map else []
                     if symbols:
                         # prioritize updating prices for holdings
                         try:
                             self._maybe_fetch_batch_prices(symbols)
                         except Exception:
                             pass
-                        for s in symbols:
-                            self._process_symbol(s, pos_map)
-                    self._save_state()
+                        self._process_holdings(symbols, pos_map)
+                    self._save_state_if_dirty()
                 except Exception:
                     pass
                 self._stop_holdings.wait(max(1.0, self.holdings_poll_seconds))
@@ -1264,8 +1507,24 @@ class NewsTrader:
         t.start()
         self._holdings_thread = t
 
+    def _process_holdings(self, symbols: List[str], pos_map: Dict[str, Dict]) -> None:
+        """Run _process_symbol over the held symbols, on the holdings pool when holdings_workers > 1."""
+        market_open = self._is_market_open()
+        if self.holdings_workers <= 1 or len(symbols) <= 1:
+            for s in symbols:
+                self._process_symbol(s, pos_map, market_open)
+            return
+        if self._holdings_pool is None:
+            self._holdings_pool = ThreadPoolExecutor(max_workers=self.holdings_workers, thread_name_prefix="nt-holdings")
+        futures = [self._holdings_pool.submit(self._process_symbol, s, pos_map, market_open) for s in symbols]
+        for fut in futures:
+            try:
+                fut.result()
+            except Exception as e:
+                print(f"  Holdings worker error: {e}")
+
     def _account_buying_power(self) -> float:
-        now = time.time()
+        now = time.monotonic()
         ts = self._acct_cache.get("ts", 0.0)
         if now - ts < 30.0 and "bp" in self._acct_cache:
             return float(self._acct_cache.get("bp", 0.0))
@@ -1291,11 +1550,7 @@ class NewsTrader:
         # Determine per-symbol cap in USD: prefer percent-of-equity when configured
         limit_usd = self.max_usd_per_symbol
         if self.max_pct_per_symbol > 0.0:
-            acct = self._account_info()
-            try:
-                eq = float(acct.get("equity", 0.0)) if isinstance(acct, dict) else 0.0
-            except Exception:
-                eq = 0.0
+            eq = self._account_equity()
             if eq > 0:
                 limit_usd = self.max_pct_per_symbol * eq
         return min(base, limit_usd)
@@ -1304,7 +1559,7 @@ class NewsTrader:
     def _load_news_cache(self) -> Dict[str, Dict]:
         try:
             if self.news_cache_path.exists():
-                data = json.loads(self.news_cache_path.read_text(encoding='utf-8'))
+                data = loads_json(self.news_cache_path.read_bytes())
                 if isinstance(data, dict):
                     return data
         except Exception:
@@ -1314,7 +1569,8 @@ class NewsTrader:
 
     def _save_news_cache(self) -> None:
         try:
-            self.news_cache_path.write_text(json.dumps(self._news_cache), encoding='utf-8')
+            with self._news_cache_lock:
+                self.news_cache_path.write_bytes(dumps_json(self._news_cache))
         except Exception:
             pass
 
@@ -1356,73 +1612,126 @@ class NewsTrader:
     # ---- Batch price fetch via Alpaca Data ----
     def _maybe_fetch_batch_prices(self, symbols: List[str]) -> None:
         if not self.use_alpaca_data:
+            self._maybe_fetch_batch_quotes(symbols)
             return
         if not symbols:
             return
         # Only attempt if we have Alpaca keys
         if not (self.alpaca_key and self.alpaca_secret):
+            self._maybe_fetch_batch_quotes(symbols)
             return
+        # Drop leftovers (symbols that returned before using theirs) so they cannot pass for fresh prices later
+        cutoff = time.monotonic() - self._batch_price_max_age()
+        for sym in [s for s, (_px, ts) in self._batch_prices.items() if ts < cutoff]:
+            self._batch_prices.pop(sym, None)
         # Respect market-only-price; if closed, skip to avoid stale snapshots
-        if self.market_only_price and not self._is_market_open() and not self.snapshot_offhours_prices:
+        market_open = self._is_market_open()
+        if self.market_only_price and not market_open and not self.snapshot_offhours_prices:
             return
+        # Finnhub fills snapshot gaps whenever _process_symbol would otherwise quote the symbol itself
+        fallback_token = self.finnhub_token if (market_open or not self.market_only_price) else None
         try:
-            snaps = alpaca_snapshots(symbols, self.alpaca_key, self.alpaca_secret, self.alpaca_data_base_url)
+            snaps = prices_batch(
+                symbols, self.alpaca_key, self.alpaca_secret, fallback_token,
+                data_base_url=self.alpaca_data_base_url, gate=self._fh_rate_gate,
+            )
             now = time.time()
+            fetched = time.monotonic()
             for sym, px in snaps.items():
                 if px is not None:
                     self._set_state(sym, "last_price", float(px))
                     self._set_state(sym, "last_price_ts", now)
+                    self._batch_prices[sym] = (float(px), fetched)
         except Exception:
             pass
 
-    # ---- news dedupe ----
-    def _normalize_text(self, text: str, symbol: str) -> List[str]:
-        if not isinstance(text, str):
-            return []
-        t = text.lower()
-        t = re.sub(r"[^a-z0-9\s]+", " ", t)
-        t = t.replace(symbol.lower(), " ")
-        tokens = [w for w in t.split() if len(w) > 2 and w not in {"the","and","for","with","from","into","over","this","that","are","was","were","will","has","have","had","a","an","of","to","in","on","by","as","at","is","it"}]
-        return tokens
+    def _batch_price_max_age(self) -> float:
+        return self.price_poll_seconds if self.price_poll_seconds > 0 else _BATCH_PRICE_MAX_AGE
+
+    def _take_batch_price(self, symbol: str) -> Optional[float]:
+        """Pop this symbol's prefetched price; None when there is none or it is too old to count as fresh."""
+        entry = self._batch_prices.pop(symbol, None)
+        if entry is None:
+            return None
+        px, fetched = entry
+        if time.monotonic() - fetched > self._batch_price_max_age():
+            return None
+        return px
+
+    def _maybe_fetch_batch_quotes(self, symbols: List[str]) -> None:
+        """Prefetch stale Finnhub quotes for a batch concurrently (rate gate still applies per call).
+
+        Only used with a price cooldown, since that is what lets _process_symbol reuse the cached price.
+        """
+        if self.price_poll_seconds <= 0 or len(symbols) < 2:
+            return
+        if self.market_only_price and not self._is_market_open():
+            return
+        now = time.time()
+        stale = [
+            s for s in symbols
+            if not self.state.get(s, {}).get("last_price")
+            or (now - self.state.get(s, {}).get("last_price_ts", 0)) >= self.price_poll_seconds
+        ]
+        if len(stale) < 2:
+            return
+        quotes = finnhub_quotes_batch(self.finnhub_token, stale, gate=self._fh_rate_gate)
+        now = time.time()
+        for sym, px in quotes.items():
+            if px is not None:
+                self._set_state(sym, "last_price", float(px))
+                self._set_state(sym, "last_price_ts", now)
 
+    # ---- news dedupe ----
     def _event_key(self, item: Dict, symbol: str) -> str:
-        parts = []
+        # The same headline recurs every poll and across symbols; the tokenize+hash work is memoized
+        # on the plain field values by _event_key_cached
+        fields = []
         for key in ("headline", "title", "summary"):
             val = item.get(key)
-            if isinstance(val, str) and val:
-                parts.append(val)
-        text = ". ".join(parts)
-        toks = self._normalize_text(text, symbol)
-        if not toks:
-            # Fallback to hashed headline
-            h = (item.get("headline") or "").encode("utf-8", errors="ignore")
-            return hashlib.sha1(h).hexdigest()
+            fields.append(val if isinstance(val, str) else "")
         try:
             dt = int(item.get("datetime") or 0)
             day_bucket = datetime.fromtimestamp(dt).strftime("%Y-%m-%d") if dt else ""
         except Exception:
             day_bucket = ""
-        sig = " ".join(sorted(set(toks))) + (f"|{day_bucket}" if day_bucket else "")
-        return hashlib.sha1(sig.encode("utf-8", errors="ignore")).hexdigest()
+        return _event_key_cached(fields[0], fields[1], fields[2], symbol.lower(), day_bucket)
 
-    def _dedupe_news(self, symbol: str, items: List[Dict]) -> List[Dict]:
-        unique: List[Dict] = []
-        seen_keys: set = set()
-        for it in items:
-            ekey = self._event_key(it, symbol)
-            if ekey in seen_keys:
-                continue
-            seen_keys.add(ekey)
-            unique.append(it)
-        return unique
+    def _ekey(self, item: Dict, symbol: str) -> str:
+        """_event_key memoized on the item as "_ekey".
+
+        Macro (GDELT) items are shared by every symbol and the key depends on the symbol, so they are
+        never memoized.
+        """
+        if item.get("is_macro"):
+            return self._event_key(item, symbol)
+        ekey = item.get("_ekey")
+        if not isinstance(ekey, str):
+            ekey = self._event_key(item, symbol)
+            item["_ekey"] = ekey
+        return ekey
+
+    # ---- helpers: strategy decision step (one is bound to _decide_fn at init) ----
+    def _decide_rule(self, used_sent: float, gpt_decision: Optional[str], avg_conf: Optional[float]) -> Tuple[str, str]:
+        # rule strategy: optionally override if user explicitly asked to use gpt decision via flag
+        if self.use_gpt_decision and gpt_decision:
+            return gpt_decision, "gpt"
+        return decide_action(used_sent, self.args.pos_threshold, self.args.close_threshold), "rule"
+
+    def _decide_gpt(self, used_sent: float, gpt_decision: Optional[str], avg_conf: Optional[float]) -> Tuple[str, str]:
+        if gpt_decision:
+            return gpt_decision, "gpt"
+        return decide_action(used_sent, self.args.pos_threshold, self.args.close_threshold), "rule"
+
+    def _decide_hybrid(self, used_sent: float, gpt_decision: Optional[str], avg_conf: Optional[float]) -> Tuple[str, str]:
+        # Use GPT if available and avg confidence >= threshold
+        if gpt_decision and avg_conf is not None and avg_conf >= self.gpt_conf_min:
+            return gpt_decision, "gpt"
+        return decide_action(used_sent, self.args.pos_threshold, self.args.close_threshold), "rule"
 
     # ---- helpers: price context parsing and factor score ----
     def _market_day(self, ts: float) -> str:
-        try:
-            from zoneinfo import ZoneInfo
-            tz = ZoneInfo(self.market_tz)
-        except Exception:
-            tz = None
+        tz = self._market_zone
         dt = datetime.fromtimestamp(ts, tz) if tz else datetime.fromtimestamp(ts)
         return dt.strftime("%Y-%m-%d")
 
@@ -1434,7 +1743,7 @@ class NewsTrader:
             sym["last_entry_day"] = self._market_day(now)
             if price is not None:
                 sym["last_entry_price"] = float(price)
-            self._save_state()
+            self._state_dirty = True
         except Exception:
             pass
 
@@ -1454,14 +1763,24 @@ class NewsTrader:
                 days = pdt.setdefault("days", [])
                 if exit_day not in days:
                     days.append(exit_day)
+                    self._dt_count_memo = None
                 # Trim to last ~7 days to approximate 5 trading days
                 if len(days) > 7:
                     days[:] = days[-7:]
-            self._save_state()
+            self._state_dirty = True
         except Exception:
             pass
 
     def _daytrade_count_5d(self) -> int:
+        today = datetime.now().strftime("%Y-%m-%d")
+        memo = self._dt_count_memo
+        if memo is not None and memo[0] == today:
+            return memo[1]
+        count = self._count_daytrades_5d()
+        self._dt_count_memo = (today, count)
+        return count
+
+    def _count_daytrades_5d(self) -> int:
         try:
             pdt = self.state.get("__pdt__", {})
             days = pdt.get("days", [])
@@ -1492,51 +1811,47 @@ class NewsTrader:
         if not s or not isinstance(s, str):
             return None
         out: Dict[str, object] = {}
-        try:
-            # change=+1.23%
-            if "change=" in s and "%" in s:
-                frag = s.split("change=")[1].split("%", 1)[0]
-                out["change_pct"] = float(frag)
-        except Exception:
-            pass
-        try:
-            # vol~0.45%
-            if "vol~" in s and "%" in s:
-                frag = s.split("vol~")[1].split("%", 1)[0]
-                out["vol_pct"] = float(frag)
-        except Exception:
-            pass
-        try:
-            if "trend=" in s:
-                frag = s.split("trend=")[1].split(",", 1)[0].strip()
-                out["trend"] = frag
-        except Exception:
-            pass
-        # Extract series
-        try:
-            if "series=[" in s:
-                seg = s.split("series=[", 1)[1].split("]", 1)[0]
-                nums = []
-                for tok in seg.split(","):
-                    tok = tok.strip()
-                    if tok:
-                        try:
-                            nums.append(float(tok))
-                        except Exception:
-                            pass
-                if nums:
-                    out["series"] = nums
-                    out["last_px"] = nums[-1]
-                    out["min_px"] = min(nums)
-                    out["max_px"] = max(nums)
-        except Exception:
-            pass
+        # One scan over the summary built by _update_and_summarize_price_history; the first occurrence
+        # of each field wins
+        for m in _PRICE_CTX_RE.finditer(s):
+            key = m.lastgroup
+            val = m.group(key)
+            try:
+                if key == "chg":
+                    if "change_pct" not in out:
+                        out["change_pct"] = float(val)
+                elif key == "vol":
+                    if "vol_pct" not in out:
+                        out["vol_pct"] = float(val)
+                elif key == "tr":
+                    if "trend" not in out:
+                        out["trend"] = val.strip()
+                elif "series" not in out:
+                    nums = []
+                    for tok in val.split(","):
+                        tok = tok.strip()
+                        if tok:
+                            try:
+                                nums.append(float(tok))
+                            except Exception:
+                                pass
+                    if nums:
+                        mn = mx = nums[0]
+                        for v in nums:
+                            if v < mn:
+                                mn = v
+                            elif v > mx:
+                                mx = v
+                        out["series"] = nums
+                        out["last_px"] = nums[-1]
+                        out["min_px"] = mn
+                        out["max_px"] = mx
+            except Exception:
+                pass
         return out
 
     def _compute_factor_score(self, ctx: Dict) -> float:
         # Map change %, vol %, and trend to a [-1,1] adjustment
-        def _clamp(x: float, lo: float, hi: float) -> float:
-            return hi if x > hi else (lo if x < lo else x)
         ch = 0.0
         vol = 0.0
         trend = str(ctx.get("trend", "") or "")
@@ -1567,9 +1882,13 @@ class NewsTrader:
         try:
             series = ctx.get("series")
             if isinstance(series, list) and len(series) >= 2:
-                mn = float(ctx.get("min_px", min(series)))
-                mx = float(ctx.get("max_px", max(series)))
-                last = float(ctx.get("last_px", series[-1]))
+                # _parse_price_ctx already stores min/max/last; only rescan the series when they are missing
+                mn = ctx.get("min_px")
+                mn = float(mn if mn is not None else min(series))
+                mx = ctx.get("max_px")
+                mx = float(mx if mx is not None else max(series))
+                last = ctx.get("last_px")
+                last = float(last if last is not None else series[-1])
                 if mx > mn:
                     pos = (last - mn) / (mx - mn)  # 0..1
                     sc_rng = (pos - 0.5) * 2.0  # -1..1 centered
@@ -1581,6 +1900,21 @@ class NewsTrader:
         return _clamp(score, -1.0, 1.0)
 
 
+def _order_or_error(place: Callable[[], Dict]) -> Dict:
+    """Run an order call, turning an exception into the same error dict alpaca_place_order returns."""
+    try:
+        resp = place()
+    except Exception as e:
+        return {"status": "error", "code": "exception", "message": str(e)}
+    if not isinstance(resp, dict):
+        return {"status": "error", "code": "response", "message": f"unexpected order response: {resp!r}"}
+    return resp
+
+
+def _clamp(x: float, lo: float, hi: float) -> float:
+    return hi if x > hi else (lo if x < lo else x)
+
+
 def _as_date(s, default):
     from dateutil.parser import isoparse
     from datetime import datetime
@@ -1593,6 +1927,64 @@ def _as_date(s, default):
     except Exception as e:
         raise ValueError(f"Invalid date '{s}': {e}")
 
+def _load_zone(name: str):
+    try:
+        from zoneinfo import ZoneInfo
+        return ZoneInfo(name)
+    except Exception:
+        return None
+
+
+def _lru_get(cache: Dict, key: str):
+    """dict.get that also moves a hit to the end, keeping insertion order == recency order."""
+    val = cache.pop(key, None)
+    if val is not None:
+        cache[key] = val
+    return val
+
+
+def _trim_lru(cache: Dict, cap: int) -> None:
+    """Drop least-recently-used entries (the oldest insertions) until len(cache) <= cap."""
+    excess = len(cache) - max(0, cap)
+    if excess > 0:
+        for k in list(islice(cache, excess)):
+            # pop, not del: with symbol/holdings workers another thread may have trimmed the key already
+            cache.pop(k, None)
+
+
+def _tokenize_news(text: str, symbol_lower: str) -> List[str]:
+    t = _NON_ALNUM.sub(" ", text.lower()).replace(symbol_lower, " ")
+    return [w for w in t.split() if len(w) > 2 and w not in _STOPWORDS]
+
+
+@lru_cache(maxsize=8192)
+def _event_key_cached(headline: str, title: str, summary: str, symbol_lower: str, day_bucket: str) -> str:
+    """Event key for a news item: digest of its sorted distinct tokens plus the day bucket."""
+    text = ". ".join(v for v in (headline, title, summary) if v)
+    toks = _tokenize_news(text, symbol_lower)
+    if not toks:
+        # Fallback to hashed headline
+        return _content_digest(headline.encode("utf-8", errors="ignore"))
+    sig = " ".join(sorted(set(toks))) + (f"|{day_bucket}" if day_bucket else "")
+    return _content_digest(sig.encode("utf-8", errors="ignore"))
+
+
+def _content_digest(data: bytes) -> str:
+    """Hex identity digest for event keys: xxh3-64 when xxhash is installed, sha1 otherwise."""
+    if xxhash is not None:
+        return xxhash.xxh3_64_hexdigest(data)
+    return hashlib.sha1(data).hexdigest()
+
+
+def _window_start(series: Sequence[Dict[str, float]], cutoff: float) -> int:
+    """Index of the first point at or after cutoff in a time-ordered price series."""
+    i = 0
+    n = len(series)
+    while i < n and series[i].get("ts", 0) < cutoff:
+        i += 1
+    return i
+
+
 def _now_ts() -> float:
     return time.time()
 
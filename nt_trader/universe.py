@@ -1,24 +1,64 @@
 from __future__ import annotations
 
-from typing import List
+import json
+import time
+from pathlib import Path
+from typing import List, Optional
 import requests
 
 
-def fetch_sp500_tickers() -> List[str]:
+def _read_cached_tickers(path: Path, ttl_seconds: float) -> Optional[List[str]]:
+    try:
+        if not path.exists():
+            return None
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if not isinstance(data, dict):
+            return None
+        if ttl_seconds > 0 and (time.time() - float(data.get("ts", 0))) > ttl_seconds:
+            return None
+        tickers = data.get("tickers")
+        if isinstance(tickers, list) and tickers:
+            return [str(t) for t in tickers]
+    except Exception:
+        return None
+    return None
+
+
+def _write_cached_tickers(path: Path, tickers: List[str]) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"ts": time.time(), "tickers": tickers}), encoding="utf-8")
+    except Exception:
+        pass
+
+
+def fetch_sp500_tickers(cache_path: str | Path | None = "logs/sp500_cache.json", ttl_seconds: float = 86400.0) -> List[str]:
+    """Return S&P 500 constituents, reusing a local cache file while it is fresher than ttl_seconds.
+
+    Pass cache_path=None to always fetch from the network.
+    """
+    cache = Path(cache_path) if cache_path else None
+    if cache is not None:
+        cached = _read_cached_tickers(cache, ttl_seconds)
+        if cached:
+            return cached
     sources = [
         "https://datahub.io/core/s-and-p-500-companies/r/constituents.json",
         "https://datahub.io/core/s-and-p-500-companies/r/constituents.csv",
     ]
     try:
-        r = requests.get(sources[0], timeout=20)
+        r = requests.get(sources[0], timeout=(3, 20))
         r.raise_for_status()
         data = r.json()
         tickers = [row.get("Symbol") or row.get("symbol") for row in data]
-        return sorted({t.strip().upper() for t in tickers if t})
+        out = sorted({t.strip().upper() for t in tickers if t})
+        if cache is not None and out:
+            _write_cached_tickers(cache, out)
+        return out
     except Exception:
         pass
     try:
-        r = requests.get(sources[1], timeout=20)
+        r = requests.get(sources[1], timeout=(3, 20))
         r.raise_for_status()
         lines = r.text.splitlines()
         tickers = []
@@ -28,8 +68,15 @@ def fetch_sp500_tickers() -> List[str]:
             parts = line.split(",")
             if parts and parts[0]:
                 tickers.append(parts[0].strip().upper())
-        return sorted({t for t in tickers if t})
+        out = sorted({t for t in tickers if t})
+        if cache is not None and out:
+            _write_cached_tickers(cache, out)
+        return out
     except Exception:
         pass
+    # Network unavailable: a stale cache still beats the hardcoded fallback
+    if cache is not None:
+        stale = _read_cached_tickers(cache, 0)
+        if stale:
+            return stale
     return sorted({"AAPL", "MSFT", "AMZN", "GOOGL", "META", "BRK.B", "NVDA", "JPM", "TSLA", "UNH"})
-
@@ -0,0 +1,52 @@
+import threading
+import time
+import unittest
+
+from nt_trader.clients import fetch_many
+
+
+def _sleeper(seconds: float):
+    return lambda: time.sleep(seconds)
+
+
+class FetchManyTest(unittest.TestCase):
+    def test_results_in_input_order(self):
+        calls = [(lambda i=i: (time.sleep(0.01 * (5 - i)), i)[1]) for i in range(5)]
+        self.assertEqual(fetch_many(calls), [0, 1, 2, 3, 4])
+
+    def test_top_level_overlaps(self):
+        t0 = time.monotonic()
+        fetch_many([_sleeper(0.2)] * 4)
+        self.assertLess(time.monotonic() - t0, 0.5)
+
+    def test_nested_fan_out_in_worker_overlaps(self):
+        # The nested fan-out is the second call, so it runs inside a pool worker
+        t0 = time.monotonic()
+        fetch_many([_sleeper(0.2), lambda: fetch_many([_sleeper(0.2)] * 4)])
+        self.assertLess(time.monotonic() - t0, 0.5)
+
+    def test_nested_fan_out_on_calling_thread_overlaps(self):
+        t0 = time.monotonic()
+        fetch_many([lambda: fetch_many([_sleeper(0.2)] * 4), _sleeper(0.2)])
+        self.assertLess(time.monotonic() - t0, 0.5)
+
+    def test_deep_nesting_runs_inline_without_deadlock(self):
+        done = threading.Event()
+
+        def level3():
+            fetch_many([_sleeper(0.01)] * 3)
+            done.set()
+
+        fetch_many([_sleeper(0.0), lambda: fetch_many([_sleeper(0.0), lambda: fetch_many([_sleeper(0.0), level3])])])
+        self.assertTrue(done.is_set())
+
+    def test_exception_is_reraised(self):
+        def boom():
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            fetch_many([_sleeper(0.0), boom])
+
+
+if __name__ == "__main__":
+    unittest.main()